@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ALLOWED_SUFFIXES = {".png", ".jpg", ".jpeg", ".svg"}
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class AssetIndex:
+    def __init__(self, folders: Dict[str, Path], meta_file: Path):
+        self._folders = {k: Path(v) for k, v in folders.items()}
+        self._meta_file = Path(meta_file)
+        self._files: Dict[str, Tuple[Optional[Tuple[int, int]], List[str]]] = {}
+        self._meta: Optional[Tuple[Optional[Tuple[int, int]], dict]] = None
+        self._lock = threading.Lock()
+
+    def files(self, subdir: str) -> List[str]:
+        folder = self._folders[subdir]
+        key = _stat_key(folder)
+        with self._lock:
+            cached = self._files.get(subdir)
+            if cached is not None and cached[0] == key:
+                return list(cached[1])
+        names: List[str] = []
+        if key is not None:
+            names = sorted(
+                [p.name for p in folder.iterdir() if p.is_file() and p.suffix.lower() in ALLOWED_SUFFIXES],
+                key=str.casefold,
+            )
+        with self._lock:
+            self._files[subdir] = (key, names)
+        return list(names)
+
+    def invalidate(self, subdir: Optional[str] = None):
+        with self._lock:
+            if subdir is None:
+                self._files.clear()
+                self._meta = None
+            else:
+                self._files.pop(subdir, None)
+
+    def meta(self) -> dict:
+        key = _stat_key(self._meta_file)
+        with self._lock:
+            if self._meta is not None and self._meta[0] == key:
+                return dict(self._meta[1])
+        data: dict = {}
+        if key is not None:
+            try:
+                loaded = json.loads(self._meta_file.read_text(encoding="utf-8"))
+                data = loaded if isinstance(loaded, dict) else {}
+            except Exception:
+                data = {}
+        with self._lock:
+            self._meta = (key, data)
+        return dict(data)
+
+    def save_meta(self, meta: dict) -> bool:
+        if meta == self.meta():
+            return False
+        self._meta_file.parent.mkdir(parents=True, exist_ok=True)
+        self._meta_file.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        with self._lock:
+            self._meta = (_stat_key(self._meta_file), dict(meta))
+        return True
+
+
+def reconcile_meta(meta: dict, files: List[str]) -> dict:
+    return {name: meta.get(name, "default") for name in files}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class Saturated(Exception):
+    pass
+
+
+class BoundedExecutor:
+    def __init__(self, name: str, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"overviewmaker-{name}")
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _release(self, _future):
+        with self._lock:
+            self._inflight -= 1
+            self.completed += 1
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            if self._inflight >= self.workers + self.max_pending:
+                self.rejected += 1
+                raise Saturated()
+            self._inflight += 1
+        ctx = contextvars.copy_context()
+        try:
+            future = self._pool.submit(ctx.run, fn, *args)
+        except BaseException:
+            with self._lock:
+                self._inflight -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "running": min(self._inflight, self.workers),
+                "queued": max(self._inflight - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
@@ -1,29 +1,151 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import http.client
 import io
 import json
+import logging
 import mimetypes
 import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
 from pathlib import Path
-from typing import List, Optional
-from urllib import error, parse, request
+from typing import Any, Dict, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib import parse
 
-from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi import FastAPI, File, Form, Header, HTTPException, Query, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.background import BackgroundTask
+
+from pptx import Presentation
+
+from ppt_engine import (
+    ENGINE_DIGEST,
+    LAYOUT_FILE_SUFFIX,
+    build_pptx,
+    clear_template_cache,
+    image_digest,
+    iter_pptx_chunks,
+    layout_digest,
+    parse_manifest,
+    preload_template,
+    render_preview,
+    save_pptx,
+    set_image_meta_dir,
+    template_digest,
+)
 
-from ppt_engine import generate_pptx
+try:
+    from api.asset_index import AssetIndex, reconcile_meta
+    from api.executor import BoundedExecutor, Saturated
+    from api.github_cache import ResponseCache
+    from api.github_http import ConnectionPool
+    from api.jobs import JobQueue, QueueFull
+    from api.metrics import BYTES_BUCKETS, COUNT_BUCKETS, Metrics, MetricsMiddleware
+    from api.result_cache import ResultCache
+    from api.templates import InvalidTemplate, TemplateRegistry, UnknownTemplate
+    from api.thumbnails import THUMB_FORMATS, THUMB_SIZES, ThumbnailCache
+except Exception:
+    from asset_index import AssetIndex, reconcile_meta
+    from executor import BoundedExecutor, Saturated
+    from github_cache import ResponseCache
+    from github_http import ConnectionPool
+    from jobs import JobQueue, QueueFull
+    from metrics import BYTES_BUCKETS, COUNT_BUCKETS, Metrics, MetricsMiddleware
+    from result_cache import ResultCache
+    from templates import InvalidTemplate, TemplateRegistry, UnknownTemplate
+    from thumbnails import THUMB_FORMATS, THUMB_SIZES, ThumbnailCache
 
 app = FastAPI(title="OverviewMaker API")
+logger = logging.getLogger("overviewmaker")
 
 ROOT = Path(__file__).resolve().parents[1]
-TEMPLATE_FILE = str(ROOT / "template.pptx")
+TEMPLATE_DIR = Path(os.getenv("TEMPLATE_DIR", "").strip() or ROOT)
+TEMPLATES = TemplateRegistry(
+    TEMPLATE_DIR,
+    default=os.getenv("TEMPLATE_DEFAULT", "template").strip() or "template",
+    preload=preload_template,
+    evict=clear_template_cache,
+    layout_suffix=LAYOUT_FILE_SUFFIX,
+)
+TEMPLATES.start(float(os.getenv("TEMPLATE_RELOAD_SECONDS", "2")))
+TEMPLATE_FILE = str(TEMPLATE_DIR / f"{TEMPLATES.default}.pptx")
 LOGO_DIR = str(ROOT / "assets" / "logos")
 ARTWORK_DIR = str(ROOT / "assets" / "artworks")
 ASSETS_DIR = ROOT / "assets"
 ARTWORK_META_FILE = Path(ARTWORK_DIR) / "_meta.json"
+ASSET_INDEX = AssetIndex({"logos": Path(LOGO_DIR), "artworks": Path(ARTWORK_DIR)}, ARTWORK_META_FILE)
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").strip().rstrip("/")
+GH_CACHE = ResponseCache(
+    ttl_s=float(os.getenv("GITHUB_CACHE_TTL", "60")),
+    max_bytes=int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
+GITHUB_BATCH_COMMITS = os.getenv("GITHUB_BATCH_COMMITS", "1").strip().lower() not in ("0", "false", "no")
+GH_POOL = ConnectionPool(GITHUB_API_URL)
+GH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, int(os.getenv("GITHUB_CONCURRENCY", "8"))),
+    thread_name_prefix="overviewmaker-github",
+)
+PREFETCH_STATS: Dict[str, int] = {"fetched": 0, "failed": 0}
+PREFETCH_LOCK = threading.Lock()
+DECK_MANIFEST = os.getenv("DECK_MANIFEST", "1").strip().lower() not in ("0", "false", "no")
+PPTX_RESPONSE_MODE = os.getenv("PPTX_RESPONSE_MODE", "file").strip().lower()
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(256 * 1024 * 1024)))
+JOBS = JobQueue(
+    Path(os.getenv("JOB_RESULTS_DIR", "").strip() or Path(tempfile.gettempdir()) / "overviewmaker-jobs"),
+    workers=max(1, int(os.getenv("JOB_WORKERS", "2"))),
+    max_pending=max(1, int(os.getenv("JOB_MAX_PENDING", "16"))),
+    ttl_s=max(60, int(os.getenv("JOB_TTL_SECONDS", "3600"))),
+)
+JOBS.start(float(os.getenv("JOB_REAP_SECONDS", "60")))
+BUILD_POOL = BoundedExecutor(
+    "build",
+    workers=max(1, int(os.getenv("BUILD_WORKERS", "2"))),
+    max_pending=max(0, int(os.getenv("BUILD_MAX_PENDING", "8"))),
+)
+IO_POOL = BoundedExecutor(
+    "io",
+    workers=max(1, int(os.getenv("IO_WORKERS", "32"))),
+    max_pending=max(0, int(os.getenv("IO_MAX_PENDING", "256"))),
+)
+RESULT_CACHE = (
+    ResultCache(
+        Path(os.getenv("RESULT_CACHE_DIR", "").strip() or Path(tempfile.gettempdir()) / "overviewmaker-results"),
+        max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+    )
+    if os.getenv("RESULT_CACHE", "1").strip().lower() not in ("0", "false", "no")
+    else None
+)
+set_image_meta_dir(os.getenv("IMAGE_META_DIR", "").strip() or Path(tempfile.gettempdir()) / "overviewmaker-image-meta")
+THUMBNAILS = ThumbnailCache(
+    Path(os.getenv("THUMB_CACHE_DIR", "").strip() or Path(tempfile.gettempdir()) / "overviewmaker-thumbs"),
+    digest=lambda path: image_digest(str(path)),
+)
+THUMB_DEFAULT_SIZE = 256
+THUMB_MAX_AGE = int(os.getenv("THUMB_MAX_AGE", "3600"))
+THUMB_PREGENERATE = os.getenv("THUMB_PREGENERATE", "1").strip().lower() not in ("0", "false", "no")
+PREVIEW_DEFAULT_WIDTH = int(os.getenv("PREVIEW_WIDTH", "960"))
+PREVIEW_MAX_WIDTH = int(os.getenv("PREVIEW_MAX_WIDTH", "1920"))
+PREVIEW_WIDTH_STEP = 320
+METRICS = Metrics(os.getenv("METRICS_ENABLED", "0").strip().lower() in ("1", "true", "yes"))
+METRICS.histogram("request_duration_seconds", "HTTP request latency by route.")
+METRICS.histogram("phase_seconds", "Time spent per generation phase.")
+METRICS.histogram("github_request_seconds", "GitHub API round-trip latency.")
+METRICS.histogram("asset_prefetch_seconds", "Time to fetch one missing asset from GitHub.")
+METRICS.histogram("deck_bytes", "Size of generated decks.", BYTES_BUCKETS)
+METRICS.histogram("deck_slides", "Slides per generated deck.", COUNT_BUCKETS)
+METRICS.counter("slides_total", "Slides built.")
+METRICS.counter("slides_failed_total", "Products skipped because their slide failed.")
+METRICS.counter("image_meta_lookups_total", "Logo/artwork header cache lookups.")
+METRICS.counter("media_refs_total", "Picture references embedded in decks.")
+METRICS.counter("media_parts_total", "Distinct media parts written to decks.")
 
 if ASSETS_DIR.exists():
     app.mount("/assets", StaticFiles(directory=str(ASSETS_DIR)), name="assets")
@@ -34,14 +156,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Preview-Ms", "X-Slides", "X-Failed", "X-Slides-Per-Second"],
 )
+if METRICS.enabled:
+    app.add_middleware(
+        MetricsMiddleware,
+        metrics=METRICS,
+        server_timing=os.getenv("SERVER_TIMING", "1").strip().lower() not in ("0", "false", "no"),
+    )
+
 
+def _upload_stream(upload: UploadFile):
+    upload.file.seek(0)
+    return upload.file
 
-def _to_bytes_file(upload: UploadFile):
-    data = upload.file.read()
-    buff = io.BytesIO(data)
-    buff.seek(0)
-    return buff
+
+def _upload_size(upload: UploadFile) -> int:
+    fh = upload.file
+    fh.seek(0, os.SEEK_END)
+    size = fh.tell()
+    fh.seek(0)
+    return size
+
+
+def _check_upload_budget(uploads: List[Optional[UploadFile]]):
+    METRICS.mark_since_start("upload")
+    total = sum(_upload_size(u) for u in uploads if u is not None)
+    if total > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"uploads total {total} bytes, limit is {MAX_UPLOAD_BYTES} bytes",
+        )
+
+
+async def _offload(pool: BoundedExecutor, fn, *args):
+    try:
+        return await pool.run(fn, *args)
+    except Saturated:
+        raise HTTPException(status_code=429, detail="server is busy, retry later", headers={"Retry-After": "1"})
+
+
+async def _io(fn, *args):
+    return await _offload(IO_POOL, fn, *args)
+
+
+async def _build(fn, *args):
+    return await _offload(BUILD_POOL, fn, *args)
+
+
+def _image_options() -> Optional[dict]:
+    if os.getenv("IMAGE_NORMALIZE", "1").strip().lower() in ("0", "false", "no"):
+        return None
+    options = {}
+    for env_name, key in (
+        ("IMAGE_TARGET_DPI", "dpi"),
+        ("IMAGE_JPEG_QUALITY", "jpeg_quality"),
+        ("IMAGE_PNG_COMPRESS_LEVEL", "png_compress_level"),
+    ):
+        value = os.getenv(env_name, "").strip()
+        if value.isdigit():
+            options[key] = int(value)
+    return options
+
+
+def _save_options() -> Optional[dict]:
+    if os.getenv("PPTX_SAVE", "fast").strip().lower() == "standard":
+        return None
+    options = {}
+    for env_name, key in (("PPTX_MEDIA_LEVEL", "media_level"), ("PPTX_XML_LEVEL", "xml_level")):
+        value = os.getenv(env_name, "").strip()
+        if value.isdigit():
+            options[key] = min(int(value), 9)
+    return options
+
+
+def _generate_workers() -> int:
+    value = os.getenv("GENERATE_WORKERS", "").strip()
+    return max(1, int(value)) if value.isdigit() else 1
 
 
 def _asset_dir(kind: str) -> Path:
@@ -62,28 +253,12 @@ def _asset_subdir(kind: str) -> str:
     raise HTTPException(status_code=400, detail="invalid kind")
 
 
-def _list_files_local(folder: Path) -> List[str]:
-    if not folder.exists():
-        return []
-    allowed = {".png", ".jpg", ".jpeg", ".svg"}
-    return sorted(
-        [p.name for p in folder.iterdir() if p.is_file() and p.suffix.lower() in allowed],
-        key=str.casefold,
-    )
-
-
 def _load_artwork_meta_local() -> dict:
-    if not ARTWORK_META_FILE.exists():
-        return {}
-    try:
-        return json.loads(ARTWORK_META_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+    return ASSET_INDEX.meta()
 
 
 def _save_artwork_meta_local(meta: dict) -> None:
-    ARTWORK_META_FILE.parent.mkdir(parents=True, exist_ok=True)
-    ARTWORK_META_FILE.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    ASSET_INDEX.save_meta(meta)
 
 
 def _gh_cfg() -> Optional[dict]:
@@ -100,7 +275,7 @@ def _gh_request(method: str, path: str, payload: Optional[dict] = None):
     if not cfg:
         raise HTTPException(status_code=500, detail="github config missing")
 
-    url = f"https://api.github.com/repos/{cfg['repo']}{path}"
+    url_path = f"/repos/{cfg['repo']}{path}"
     data = None
     headers = {
         "Authorization": f"Bearer {cfg['token']}",
@@ -112,16 +287,36 @@ def _gh_request(method: str, path: str, payload: Optional[dict] = None):
         data = json.dumps(payload).encode("utf-8")
         headers["Content-Type"] = "application/json"
 
-    req = request.Request(url, data=data, headers=headers, method=method)
+    cache_key = f"{cfg['repo']}{path}"
+    cached = GH_CACHE.lookup(cache_key) if method == "GET" else None
+    if cached is not None:
+        if cached["fresh"]:
+            GH_CACHE.count_hit()
+            return cached["data"]
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+
+    started = time.perf_counter()
     try:
-        with request.urlopen(req, timeout=20) as resp:
-            body = resp.read()
-            return json.loads(body.decode("utf-8")) if body else {}
-    except error.HTTPError as e:
-        body = e.read().decode("utf-8", errors="ignore")
-        if e.code == 404:
-            raise FileNotFoundError(path)
-        raise HTTPException(status_code=502, detail=f"github api error: {e.code} {body[:200]}")
+        status, resp_headers, body = GH_POOL.send(method, url_path, data, headers)
+    except (OSError, http.client.HTTPException) as e:
+        raise HTTPException(status_code=502, detail=f"github api unreachable: {e}")
+    METRICS.observe("github_request_seconds", time.perf_counter() - started, method=method, status=str(status))
+
+    if status < 300:
+        result = json.loads(body.decode("utf-8")) if body else {}
+        if method == "GET":
+            GH_CACHE.store(cache_key, result, resp_headers.get("etag"), len(body))
+        return result
+    if status == 304 and cached is not None:
+        GH_CACHE.touch(cache_key)
+        return cached["data"]
+    if status == 404:
+        if method == "GET":
+            GH_CACHE.discard(cache_key)
+        raise FileNotFoundError(path)
+    text = body.decode("utf-8", errors="ignore")
+    raise HTTPException(status_code=502, detail=f"github api error: {status} {text[:200]}")
 
 
 def _gh_get_content(path_in_repo: str) -> Optional[dict]:
@@ -134,34 +329,71 @@ def _gh_get_content(path_in_repo: str) -> Optional[dict]:
     return {"sha": data.get("sha"), "bytes": decoded}
 
 
+def _gh_cache_key(cfg: dict, path_in_repo: str) -> str:
+    return f"{cfg['repo']}/contents/{parse.quote(path_in_repo)}"
+
+
+def _gh_invalidate(cfg: dict, path_in_repo: str):
+    GH_CACHE.discard(_gh_cache_key(cfg, path_in_repo))
+    GH_CACHE.discard(_gh_cache_key(cfg, str(Path(path_in_repo).parent)))
+
+
 def _gh_put_content(path_in_repo: str, content_bytes: bytes, message: str):
     cfg = _gh_cfg()
     if not cfg:
         raise HTTPException(status_code=500, detail="github config missing")
-    existing = _gh_get_content(path_in_repo)
-    payload = {
-        "message": message,
-        "content": base64.b64encode(content_bytes).decode("ascii"),
-        "branch": cfg["branch"],
-    }
-    if existing and existing.get("sha"):
-        payload["sha"] = existing["sha"]
-    _gh_request("PUT", f"/contents/{parse.quote(path_in_repo)}", payload)
+    encoded = base64.b64encode(content_bytes).decode("ascii")
+    for attempt in range(2):
+        existing = _gh_get_content(path_in_repo)
+        payload = {
+            "message": message,
+            "content": encoded,
+            "branch": cfg["branch"],
+        }
+        if existing and existing.get("sha"):
+            payload["sha"] = existing["sha"]
+        try:
+            result = _gh_request("PUT", f"/contents/{parse.quote(path_in_repo)}", payload)
+            break
+        except HTTPException:
+            _gh_invalidate(cfg, path_in_repo)
+            if attempt:
+                raise
+
+    _gh_invalidate(cfg, path_in_repo)
+    new_sha = (result.get("content") or {}).get("sha")
+    if new_sha:
+        GH_CACHE.store(
+            _gh_cache_key(cfg, path_in_repo),
+            {"name": Path(path_in_repo).name, "path": path_in_repo, "sha": new_sha, "content": encoded},
+            None,
+            len(encoded),
+        )
 
 
 def _gh_delete_content(path_in_repo: str, message: str):
     cfg = _gh_cfg()
     if not cfg:
         raise HTTPException(status_code=500, detail="github config missing")
-    existing = _gh_get_content(path_in_repo)
-    if not existing or not existing.get("sha"):
-        return
-    payload = {
-        "message": message,
-        "sha": existing["sha"],
-        "branch": cfg["branch"],
-    }
-    _gh_request("DELETE", f"/contents/{parse.quote(path_in_repo)}", payload)
+    for attempt in range(2):
+        existing = _gh_get_content(path_in_repo)
+        if not existing or not existing.get("sha"):
+            break
+        payload = {
+            "message": message,
+            "sha": existing["sha"],
+            "branch": cfg["branch"],
+        }
+        try:
+            _gh_request("DELETE", f"/contents/{parse.quote(path_in_repo)}", payload)
+            break
+        except FileNotFoundError:
+            break
+        except HTTPException:
+            _gh_invalidate(cfg, path_in_repo)
+            if attempt:
+                raise
+    _gh_invalidate(cfg, path_in_repo)
 
 
 def _gh_list_assets(subdir: str) -> List[str]:
@@ -177,6 +409,60 @@ def _gh_list_assets(subdir: str) -> List[str]:
     return sorted(files, key=str.casefold)
 
 
+def _gh_commit_files(files: Dict[str, bytes], message: str) -> dict:
+    cfg = _gh_cfg()
+    if not cfg:
+        raise HTTPException(status_code=500, detail="github config missing")
+    started = time.perf_counter()
+    timing: Dict[str, Any] = {"files": len(files)}
+
+    def create_blob(content: bytes) -> str:
+        payload = {"content": base64.b64encode(content).decode("ascii"), "encoding": "base64"}
+        return _gh_request("POST", "/git/blobs", payload)["sha"]
+
+    t = time.perf_counter()
+    paths = list(files)
+    blob_shas = dict(zip(paths, GH_EXECUTOR.map(create_blob, [files[p] for p in paths])))
+    timing["blobs_s"] = round(time.perf_counter() - t, 4)
+
+    branch = parse.quote(cfg["branch"])
+    for attempt in range(3):
+        t = time.perf_counter()
+        head_sha = _gh_request("GET", f"/git/ref/heads/{branch}")["object"]["sha"]
+        GH_CACHE.discard(f"{cfg['repo']}/git/ref/heads/{branch}")
+        base_tree = _gh_request("GET", f"/git/commits/{head_sha}")["tree"]["sha"]
+        tree = [{"path": p, "mode": "100644", "type": "blob", "sha": blob_shas[p]} for p in paths]
+        tree_sha = _gh_request("POST", "/git/trees", {"base_tree": base_tree, "tree": tree})["sha"]
+        commit_sha = _gh_request(
+            "POST",
+            "/git/commits",
+            {"message": message, "tree": tree_sha, "parents": [head_sha]},
+        )["sha"]
+        timing["tree_commit_s"] = round(time.perf_counter() - t, 4)
+        t = time.perf_counter()
+        try:
+            _gh_request("PATCH", f"/git/refs/heads/{branch}", {"sha": commit_sha, "force": False})
+        except HTTPException:
+            if attempt == 2:
+                raise
+            continue
+        timing["ref_s"] = round(time.perf_counter() - t, 4)
+        break
+
+    for p in paths:
+        encoded = base64.b64encode(files[p]).decode("ascii")
+        _gh_invalidate(cfg, p)
+        GH_CACHE.store(
+            _gh_cache_key(cfg, p),
+            {"name": Path(p).name, "path": p, "sha": blob_shas[p], "content": encoded},
+            None,
+            len(encoded),
+        )
+    timing["commit"] = commit_sha
+    timing["total_s"] = round(time.perf_counter() - started, 4)
+    return timing
+
+
 def _load_artwork_meta() -> dict:
     cfg = _gh_cfg()
     if not cfg:
@@ -200,20 +486,67 @@ def _save_artwork_meta(meta: dict):
         )
 
 
-def _sync_asset_from_github(kind: str, name: str):
+def _write_atomic(target: Path, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            out.write(data)
+        os.replace(tmp, target)
+    except Exception:
+        _unlink_quietly(tmp)
+        raise
+
+
+def _sync_asset_from_github(kind: str, name: str) -> Optional[float]:
     cfg = _gh_cfg()
     if not cfg:
-        return
+        return None
     safe_name = Path(name).name
     local_dir = _asset_dir(kind)
     local_dir.mkdir(parents=True, exist_ok=True)
     target = local_dir / safe_name
     if target.exists():
-        return
+        return None
+    started = time.perf_counter()
     subdir = _asset_subdir(kind)
     doc = _gh_get_content(f"assets/{subdir}/{safe_name}")
-    if doc and doc.get("bytes") is not None:
-        target.write_bytes(doc["bytes"])
+    if not doc or doc.get("bytes") is None:
+        raise FileNotFoundError(f"assets/{subdir}/{safe_name}")
+    _write_atomic(target, doc["bytes"])
+    return time.perf_counter() - started
+
+
+def _prefetch_assets(assets: set) -> dict:
+    missing = sorted(
+        (kind, Path(name).name)
+        for kind, name in assets
+        if not (_asset_dir(kind) / Path(name).name).exists()
+    )
+    summary: Dict[str, Any] = {"requested": len(assets), "fetched": 0, "failed": 0, "total_s": 0.0, "max_s": 0.0}
+    if not missing or not _gh_cfg():
+        return summary
+
+    started = time.perf_counter()
+    futures = {GH_EXECUTOR.submit(_sync_asset_from_github, kind, name): (kind, name) for kind, name in missing}
+    for future, (kind, name) in futures.items():
+        try:
+            latency = future.result()
+        except Exception as e:
+            summary["failed"] += 1
+            with PREFETCH_LOCK:
+                PREFETCH_STATS["failed"] += 1
+            logger.warning("asset prefetch failed kind=%s name=%s error=%s", kind, name, e)
+            continue
+        if latency is None:
+            continue
+        summary["fetched"] += 1
+        summary["max_s"] = round(max(summary["max_s"], latency), 4)
+        with PREFETCH_LOCK:
+            PREFETCH_STATS["fetched"] += 1
+        METRICS.observe("asset_prefetch_seconds", latency, kind=kind)
+        logger.info("asset prefetched kind=%s name=%s latency_ms=%.1f", kind, name, latency * 1000)
+    summary["total_s"] = round(time.perf_counter() - started, 4)
+    return summary
 
 
 def _asset_bytes(kind: str, name: str) -> bytes:
@@ -229,14 +562,14 @@ def _asset_bytes(kind: str, name: str) -> bytes:
         subdir = _asset_subdir(kind)
         doc = _gh_get_content(f"assets/{subdir}/{safe_name}")
         if doc and doc.get("bytes") is not None:
-            local_file.write_bytes(doc["bytes"])
+            _write_atomic(local_file, doc["bytes"])
             return doc["bytes"]
 
     raise HTTPException(status_code=404, detail="asset not found")
 
 
 @app.get("/")
-def root():
+async def root():
     html_path = ROOT / "web" / "index.html"
     if html_path.exists():
         return FileResponse(str(html_path), media_type="text/html")
@@ -244,17 +577,41 @@ def root():
 
 
 @app.get("/health")
-def health():
+async def health():
     return JSONResponse({"ok": True, "service": "overviewmaker-api"})
 
 
+@app.get("/metrics")
+async def metrics():
+    if not METRICS.enabled:
+        raise HTTPException(status_code=404, detail="metrics are disabled")
+    return Response(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/templates")
+async def list_templates():
+    templates = await _io(TEMPLATES.listing)
+    return JSONResponse({"default": TEMPLATES.default, "templates": templates})
+
+
 @app.get("/favicon.ico")
-def favicon():
+async def favicon():
     return Response(status_code=204)
 
 
-@app.get("/api/assets")
-def list_assets(kind: str):
+def _listing_etag(data: dict) -> str:
+    digest = hashlib.sha1(json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return f'"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag.removeprefix("W/") in [t.removeprefix("W/") for t in tags]
+
+
+def _asset_listing(kind: str) -> dict:
     sub = _asset_subdir(kind)
     if _gh_cfg():
         try:
@@ -262,63 +619,126 @@ def list_assets(kind: str):
         except FileNotFoundError:
             files = []
     else:
-        folder = _asset_dir(kind)
-        folder.mkdir(parents=True, exist_ok=True)
-        files = _list_files_local(folder)
-
-    payload = [{"name": f, "url": f"/api/assets/file?kind={kind}&name={parse.quote(f)}"} for f in files]
+        files = ASSET_INDEX.files(sub)
+
+    payload = [
+        {
+            "name": f,
+            "url": f"/api/assets/file?kind={kind}&name={parse.quote(f)}",
+            "thumb_url": f"/api/assets/thumb?kind={kind}&name={parse.quote(f)}",
+        }
+        for f in files
+    ]
     data = {"kind": kind, "files": payload}
 
     if sub == "artworks":
         meta = _load_artwork_meta()
-        for f in files:
-            meta.setdefault(f, "default")
-        stale = [k for k in list(meta.keys()) if k not in files]
-        for k in stale:
-            meta.pop(k, None)
-        _save_artwork_meta(meta)
-        data["meta"] = meta
+        reconciled = reconcile_meta(meta, files)
+        if reconciled != meta:
+            _save_artwork_meta(reconciled)
+        data["meta"] = reconciled
+    return data
 
-    return JSONResponse(data)
+
+@app.get("/api/assets")
+async def list_assets(kind: str, if_none_match: Optional[str] = Header(default=None)):
+    data = await _io(_asset_listing, kind)
+    etag = _listing_etag(data)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(data, headers=headers)
 
 
 @app.get("/api/assets/file")
-def asset_file(kind: str = Query(...), name: str = Query(...)):
-    content = _asset_bytes(kind, name)
+async def asset_file(kind: str = Query(...), name: str = Query(...)):
     mime = mimetypes.guess_type(Path(name).name)[0] or "application/octet-stream"
+    local_file = _asset_dir(kind) / Path(name).name
+    if local_file.is_file():
+        return FileResponse(str(local_file), media_type=mime)
+    content = await _io(_asset_bytes, kind, name)
     return Response(content=content, media_type=mime)
 
 
-@app.post("/api/assets/upload")
-def upload_assets(kind: str = Form(...), files: List[UploadFile] = File(default=[])):
+@app.get("/api/assets/thumb")
+async def asset_thumb(
+    kind: str = Query(...),
+    name: str = Query(...),
+    size: int = Query(THUMB_DEFAULT_SIZE),
+    fmt: Optional[str] = Query(default=None, alias="format"),
+    accept: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    if size not in THUMB_SIZES:
+        raise HTTPException(status_code=400, detail=f"size must be one of {', '.join(map(str, THUMB_SIZES))}")
+    fmt = (fmt or ("webp" if "image/webp" in (accept or "") else "png")).lower()
+    if fmt not in THUMB_FORMATS:
+        raise HTTPException(status_code=400, detail="format must be webp or png")
+    local_file = _asset_dir(kind) / Path(name).name
+    if local_file.suffix.lower() == ".svg":
+        return await asset_file(kind, name)
+    if not local_file.is_file():
+        await _io(_asset_bytes, kind, name)
+    thumb = await _io(THUMBNAILS.get, local_file, size, fmt)
+    if thumb is None:
+        return await asset_file(kind, name)
+
+    path, key = thumb
+    etag = f'"{key}.{fmt}"'
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={THUMB_MAX_AGE}", "Vary": "Accept"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(str(path), media_type=THUMB_FORMATS[fmt][1], headers=headers)
+
+
+def _store_assets(kind: str, blobs: List[tuple]) -> dict:
     folder = _asset_dir(kind)
     folder.mkdir(parents=True, exist_ok=True)
-    if not files:
-        raise HTTPException(status_code=400, detail="no files")
-
     sub = _asset_subdir(kind)
+    batched = bool(_gh_cfg()) and GITHUB_BATCH_COMMITS
     saved = []
-    for f in files:
-        name = Path(f.filename or "").name
-        if not name:
-            continue
-        data = f.file.read()
+    pending: Dict[str, bytes] = {}
+    for name, data in blobs:
         (folder / name).write_bytes(data)
-        if _gh_cfg():
+        if batched:
+            pending[f"assets/{sub}/{name}"] = data
+        elif _gh_cfg():
             _gh_put_content(f"assets/{sub}/{name}", data, f"Upload {name}")
         saved.append(name)
+    ASSET_INDEX.invalidate(sub)
+    if THUMB_PREGENERATE:
+        THUMBNAILS.pregenerate([folder / name for name in saved], (THUMB_DEFAULT_SIZE,), THUMB_FORMATS)
 
     if sub == "artworks":
         meta = _load_artwork_meta()
-        for name in saved:
-            meta.setdefault(name, "default")
-        _save_artwork_meta(meta)
+        updated = {**{name: "default" for name in saved}, **meta}
+        if updated != meta:
+            if batched:
+                _save_artwork_meta_local(updated)
+                pending["assets/artworks/_meta.json"] = json.dumps(updated, ensure_ascii=False, indent=2).encode("utf-8")
+            else:
+                _save_artwork_meta(updated)
 
-    return JSONResponse({"ok": True, "saved": saved})
+    result: Dict[str, Any] = {"ok": True, "saved": saved}
+    if pending:
+        result["github"] = _gh_commit_files(pending, f"Upload {len(saved)} {sub}")
+    return result
 
 
-@app.delete("/api/assets")
-def delete_asset(kind: str, name: str):
+@app.post("/api/assets/upload")
+async def upload_assets(kind: str = Form(...), files: List[UploadFile] = File(default=[])):
+    _asset_dir(kind)
+    if not files:
+        raise HTTPException(status_code=400, detail="no files")
+    blobs = []
+    for f in files:
+        name = Path(f.filename or "").name
+        if name:
+            blobs.append((name, await f.read()))
+    return JSONResponse(await _io(_store_assets, kind, blobs))
+
+
+def _delete_asset(kind: str, name: str):
     safe = Path(name).name
     folder = _asset_dir(kind)
     target = folder / safe
@@ -326,31 +746,329 @@ def delete_asset(kind: str, name: str):
         target.unlink()
 
     sub = _asset_subdir(kind)
+    ASSET_INDEX.invalidate(sub)
     if _gh_cfg():
         _gh_delete_content(f"assets/{sub}/{safe}", f"Delete {safe}")
 
     if sub == "artworks":
         meta = _load_artwork_meta()
-        meta.pop(safe, None)
-        _save_artwork_meta(meta)
+        if safe in meta:
+            meta.pop(safe)
+            _save_artwork_meta(meta)
+
 
+@app.delete("/api/assets")
+async def delete_asset(kind: str, name: str):
+    await _io(_delete_asset, kind, name)
     return JSONResponse({"ok": True})
 
 
+def _set_artwork_mode(safe: str, mode: str):
+    meta = _load_artwork_meta()
+    if meta.get(safe) != mode:
+        meta[safe] = mode
+        _save_artwork_meta(meta)
+
+
 @app.post("/api/assets/artwork-mode")
-def set_artwork_mode(name: str = Form(...), mode: str = Form(...)):
+async def set_artwork_mode(name: str = Form(...), mode: str = Form(...)):
     allowed = {"default", "horizontal", "small"}
     if mode not in allowed:
         raise HTTPException(status_code=400, detail="invalid mode")
-    safe = Path(name).name
-    meta = _load_artwork_meta()
-    meta[safe] = mode
-    _save_artwork_meta(meta)
+    await _io(_set_artwork_mode, Path(name).name, mode)
     return JSONResponse({"ok": True})
 
 
+def _form_product(
+    season_item: str,
+    season_color: str,
+    name: str,
+    code: str,
+    logo: str,
+    artwork_list: List[str],
+    color_name_list: List[str],
+    main_image: Any,
+    color_images: List[Any],
+) -> dict:
+    colors = []
+    for i, img in enumerate(color_images):
+        color_name = color_name_list[i] if i < len(color_name_list) else ""
+        colors.append({"img": img, "name": color_name})
+
+    return {
+        "season_item": season_item,
+        "season_color": season_color,
+        "name": name,
+        "code": code,
+        "rrp": "",
+        "main_image": main_image,
+        "logo": logo,
+        "artworks": artwork_list,
+        "colors": colors,
+    }
+
+
+def _product_assets(products: List[dict]) -> set:
+    assets = set()
+    for product in products:
+        logo = str(product.get("logo") or "")
+        if logo and logo != "선택 없음":
+            assets.add(("logo", logo))
+        assets.update(("artwork", a) for a in _split_list(product.get("artworks")))
+    return assets
+
+
+def _record_build(stats: dict):
+    if not METRICS.enabled:
+        return
+    for name, seconds in stats.get("phases", {}).items():
+        METRICS.record_phase(name, seconds)
+    METRICS.observe("deck_slides", stats.get("slides", 0))
+    METRICS.inc("slides_total", stats.get("slides", 0))
+    METRICS.inc("slides_failed_total", stats.get("failed", 0))
+    METRICS.inc("image_meta_lookups_total", stats.get("image_meta_hits", 0), result="hit")
+    METRICS.inc("image_meta_lookups_total", stats.get("image_meta_misses", 0), result="miss")
+    METRICS.inc("media_refs_total", stats.get("media_refs", 0))
+    METRICS.inc("media_parts_total", stats.get("media_parts", 0))
+
+
+def _metrics_snapshot() -> list:
+    gh = GH_CACHE.snapshot()
+    lookups = gh["hits"] + gh["revalidated"] + gh["misses"]
+    hit_ratio = round((gh["hits"] + gh["revalidated"]) / lookups, 4) if lookups else 0
+    with PREFETCH_LOCK:
+        prefetch = dict(PREFETCH_STATS)
+    cache_help = "GitHub GETs by cache outcome."
+    prefetch_help = "Assets fetched from GitHub before a build."
+    results = RESULT_CACHE.snapshot() if RESULT_CACHE is not None else None
+    rows = []
+    if results is not None:
+        result_help = "Generate requests by result cache outcome."
+        rows = [
+            ("result_cache_requests_total", "counter", result_help, {"result": "hit"}, results["hits"]),
+            ("result_cache_requests_total", "counter", result_help, {"result": "miss"}, results["misses"]),
+            ("result_cache_evictions_total", "counter", "Decks evicted from the result cache.", {}, results["evictions"]),
+            ("result_cache_bytes", "gauge", "Bytes held by the result cache.", {}, results["bytes"]),
+        ]
+    thumbs = THUMBNAILS.snapshot()
+    thumb_help = "Asset thumbnail requests by outcome."
+    rows += [
+        ("thumbnail_requests_total", "counter", thumb_help, {"result": "hit"}, thumbs["hits"]),
+        ("thumbnail_requests_total", "counter", thumb_help, {"result": "generated"}, thumbs["generated"]),
+        ("thumbnail_requests_total", "counter", thumb_help, {"result": "failed"}, thumbs["failed"]),
+    ]
+    templates = TEMPLATES.snapshot()
+    template_help = "Template (re)loads by the registry, by outcome."
+    rows += [
+        ("templates_loaded", "gauge", "Templates known to the registry.", {}, templates["templates"]),
+        ("templates_invalid", "gauge", "Templates that failed validation.", {}, templates["invalid"]),
+        ("template_loads_total", "counter", template_help, {"result": "ok"}, templates["loads"] - templates["failed"]),
+        ("template_loads_total", "counter", template_help, {"result": "failed"}, templates["failed"]),
+        ("template_loads_total", "counter", template_help, {"result": "removed"}, templates["removed"]),
+    ]
+    pool_help = "Requests offloaded to the build and I/O executors."
+    for pool_name, pool in (("build", BUILD_POOL), ("io", IO_POOL)):
+        snap = pool.snapshot()
+        rows += [
+            ("executor_running", "gauge", "Tasks running on an executor.", {"pool": pool_name}, snap["running"]),
+            ("executor_queued", "gauge", "Tasks waiting for an executor worker.", {"pool": pool_name}, snap["queued"]),
+            ("executor_tasks_total", "counter", pool_help, {"pool": pool_name, "result": "completed"}, snap["completed"]),
+            ("executor_tasks_total", "counter", pool_help, {"pool": pool_name, "result": "rejected"}, snap["rejected"]),
+        ]
+    return rows + [
+        ("github_cache_requests_total", "counter", cache_help, {"result": "hit"}, gh["hits"]),
+        ("github_cache_requests_total", "counter", cache_help, {"result": "revalidated"}, gh["revalidated"]),
+        ("github_cache_requests_total", "counter", cache_help, {"result": "miss"}, gh["misses"]),
+        ("github_cache_hit_ratio", "gauge", "Share of GitHub GETs served from cache or 304.", {}, hit_ratio),
+        ("github_cache_bytes", "gauge", "Bytes held by the GitHub response cache.", {}, gh["bytes"]),
+        ("asset_prefetch_total", "counter", prefetch_help, {"result": "fetched"}, prefetch["fetched"]),
+        ("asset_prefetch_total", "counter", prefetch_help, {"result": "failed"}, prefetch["failed"]),
+    ]
+
+
+METRICS.collector(_metrics_snapshot)
+
+
+def _template_file(template_id: str) -> str:
+    try:
+        return TEMPLATES.resolve(template_id)["file"]
+    except UnknownTemplate:
+        if not template_id.strip():
+            return TEMPLATE_FILE
+        raise HTTPException(status_code=400, detail=f"unknown template: {template_id}")
+    except InvalidTemplate as e:
+        raise HTTPException(status_code=400, detail=f"template is not usable: {e}")
+
+
+def _generate_single(product: dict, progress=None, template_file: str = TEMPLATE_FILE):
+    stats: dict = {}
+    prs = build_pptx(
+        products=[product],
+        template_file=template_file,
+        logo_dir=LOGO_DIR,
+        artwork_dir=ARTWORK_DIR,
+        stats=stats,
+        image_options=_image_options(),
+        progress=progress,
+    )
+    _record_build(stats)
+    return prs, stats
+
+
+def _pptx_headers(filename: str) -> dict:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+
+def _unlink_quietly(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _metered_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    started = time.perf_counter()
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+        yield chunk
+    METRICS.record_phase("save", time.perf_counter() - started)
+    METRICS.observe("deck_bytes", size)
+
+
+async def _upload_digest(upload: Optional[UploadFile]) -> Optional[str]:
+    if upload is None:
+        return None
+    digest = hashlib.sha256()
+    await upload.seek(0)
+    while True:
+        block = await upload.read(1024 * 1024)
+        if not block:
+            break
+        digest.update(block)
+    await upload.seek(0)
+    return digest.hexdigest()
+
+
+def _asset_state(kind: str, name: str, artwork_meta: dict) -> list:
+    path = _asset_dir(kind) / Path(name).name
+    try:
+        digest = image_digest(str(path))
+    except Exception:
+        try:
+            st = path.stat()
+            digest = f"{st.st_mtime_ns}:{st.st_size}"
+        except OSError:
+            digest = None
+    return [kind, name, digest, artwork_meta.get(Path(name).name) if kind == "artwork" else None]
+
+
+def _result_key(route: str, fields: dict, uploads: list, assets: set, template_file: str = TEMPLATE_FILE) -> Optional[str]:
+    if RESULT_CACHE is None:
+        return None
+    artwork_meta = ASSET_INDEX.meta()
+    doc = {
+        "route": route,
+        "engine": ENGINE_DIGEST,
+        "template": template_digest(template_file),
+        "layout": layout_digest(template_file),
+        "image_options": _image_options(),
+        "save_options": _save_options(),
+        "fields": fields,
+        "uploads": uploads,
+        "assets": [_asset_state(kind, name, artwork_meta) for kind, name in sorted(assets)],
+    }
+    return hashlib.sha256(json.dumps(doc, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _cached_response(key: Optional[str], if_none_match: Optional[str]):
+    if key is None:
+        return None
+    hit = RESULT_CACHE.checkout(key)
+    if hit is None:
+        return None
+    path, headers = hit
+    etag = f'"{key}"'
+    if _etag_matches(if_none_match, etag):
+        _unlink_quietly(path)
+        return Response(status_code=304, headers={"ETag": etag, "X-Cache": "hit"})
+    return FileResponse(
+        path,
+        media_type=PPTX_MEDIA_TYPE,
+        headers={**headers, "ETag": etag, "X-Cache": "hit"},
+        background=BackgroundTask(_unlink_quietly, path),
+    )
+
+
+def _save_pptx(prs, output):
+    options = _save_options()
+    if options is None:
+        prs.save(output)
+    else:
+        save_pptx(prs, output, **options)
+
+
+def _bundle_deck(path: str, filename: str, report: dict) -> str:
+    fd, bundle = tempfile.mkstemp(suffix=".zip", prefix="overviewmaker-")
+    try:
+        with os.fdopen(fd, "wb") as out, zipfile.ZipFile(out, "w") as zf:
+            zf.write(path, filename, compress_type=zipfile.ZIP_STORED)
+            zf.writestr("report.json", json.dumps(report, ensure_ascii=False, indent=2), compress_type=zipfile.ZIP_DEFLATED)
+    except Exception:
+        _unlink_quietly(bundle)
+        raise
+    finally:
+        _unlink_quietly(path)
+    return bundle
+
+
+def _pptx_response(
+    prs,
+    filename: str,
+    headers: Optional[dict] = None,
+    cache_key: Optional[str] = None,
+    report: Optional[dict] = None,
+):
+    headers = {**_pptx_headers(filename), **(headers or {})}
+    if PPTX_RESPONSE_MODE == "chunked" and cache_key is None and report is None:
+        chunks = iter_pptx_chunks(prs, save_options=_save_options())
+        if METRICS.enabled:
+            chunks = _metered_chunks(chunks)
+        return StreamingResponse(chunks, media_type=PPTX_MEDIA_TYPE, headers=headers)
+
+    fd, path = tempfile.mkstemp(suffix=".pptx", prefix="overviewmaker-")
+    try:
+        with os.fdopen(fd, "wb") as out, METRICS.span("save"):
+            _save_pptx(prs, out)
+    except Exception:
+        _unlink_quietly(path)
+        raise
+    if METRICS.enabled:
+        METRICS.observe("deck_bytes", os.path.getsize(path))
+    if report is not None:
+        path = _bundle_deck(path, filename, report)
+        headers = {**headers, **_pptx_headers(f"{Path(filename).stem}.zip"), "Content-Type": "application/zip"}
+    if cache_key is not None:
+        RESULT_CACHE.put(cache_key, path, headers)
+        headers = {**headers, "ETag": f'"{cache_key}"', "X-Cache": "miss"}
+    return FileResponse(path, media_type=PPTX_MEDIA_TYPE, headers=headers, background=BackgroundTask(_unlink_quietly, path))
+
+
+def _generate_response(product: dict, cache_key: Optional[str], template_file: str):
+    prs, stats = _generate_single(product, template_file=template_file)
+    return _pptx_response(
+        prs,
+        "BOSS_Golf_SpecSheet.pptx",
+        {"X-Image-Bytes-Saved": str(stats.get("image_bytes_saved", 0))},
+        cache_key,
+    )
+
+
 @app.post("/api/generate")
-def generate(
+async def generate(
     season_item: str = Form(""),
     season_color: str = Form("#000000"),
     name: str = Form(...),
@@ -358,46 +1076,486 @@ def generate(
     logo: str = Form("선택 없음"),
     artworks: str = Form(""),
     color_names: str = Form(""),
+    template: str = Form(""),
     main_image: UploadFile = File(...),
     color_images: List[UploadFile] = File(default=[]),
+    if_none_match: Optional[str] = Header(default=None),
 ):
     if not code.strip():
         raise HTTPException(status_code=400, detail="code is required")
+    _check_upload_budget([main_image, *color_images])
+
+    template_file = await _io(_template_file, template)
+    artwork_list = _split_list(artworks)
+    assets = _product_assets([{"logo": logo, "artworks": artwork_list}])
+    with METRICS.span("github_sync"):
+        await _io(_prefetch_assets, assets)
+    cache_key = None
+    if RESULT_CACHE is not None:
+        fields = {
+            "season_item": season_item,
+            "season_color": season_color,
+            "name": name,
+            "code": code,
+            "logo": logo,
+            "artworks": artwork_list,
+            "color_names": _split_list(color_names),
+        }
+        uploads = [await _upload_digest(u) for u in [main_image, *color_images]]
+        cache_key = await _io(_result_key, "generate", fields, uploads, assets, template_file)
+        cached = await _io(_cached_response, cache_key, if_none_match)
+        if cached is not None:
+            return cached
+
+    product = _form_product(
+        season_item,
+        season_color,
+        name,
+        code,
+        logo,
+        artwork_list,
+        _split_list(color_names),
+        _upload_stream(main_image),
+        [_upload_stream(img) for img in color_images],
+    )
+    return await _build(_generate_response, product, cache_key, template_file)
+
+
+def _preview_response(product: dict, width: int, template_file: str):
+    stats: Dict[str, Any] = {}
+    with METRICS.span("preview"):
+        img = render_preview(
+            product,
+            template_file=template_file,
+            logo_dir=LOGO_DIR,
+            artwork_dir=ARTWORK_DIR,
+            width=width,
+            stats=stats,
+        )
+        out = io.BytesIO()
+        img.save(out, "PNG", compress_level=1)
+    return Response(
+        out.getvalue(),
+        media_type="image/png",
+        headers={"Cache-Control": "no-store", "X-Preview-Ms": f"{stats.get('elapsed_s', 0) * 1000:.1f}"},
+    )
 
-    artwork_list = [a.strip() for a in artworks.split(",") if a.strip()]
-    color_name_list = [n.strip() for n in color_names.split(",") if n.strip()]
 
-    if logo and logo != "선택 없음":
-        _sync_asset_from_github("logo", logo)
-    for art in artwork_list:
-        _sync_asset_from_github("artwork", art)
+@app.post("/api/preview")
+async def preview(
+    season_item: str = Form(""),
+    season_color: str = Form("#000000"),
+    name: str = Form(""),
+    code: str = Form(""),
+    logo: str = Form("선택 없음"),
+    artworks: str = Form(""),
+    color_names: str = Form(""),
+    width: int = Form(PREVIEW_DEFAULT_WIDTH),
+    template: str = Form(""),
+    main_image: Optional[UploadFile] = File(default=None),
+    color_images: List[UploadFile] = File(default=[]),
+):
+    uploads = [u for u in [main_image, *color_images] if u is not None]
+    _check_upload_budget(uploads)
+    template_file = await _io(_template_file, template)
+    artwork_list = _split_list(artworks)
+    with METRICS.span("github_sync"):
+        await _io(_prefetch_assets, _product_assets([{"logo": logo, "artworks": artwork_list}]))
+    product = _form_product(
+        season_item,
+        season_color,
+        name,
+        code,
+        logo,
+        artwork_list,
+        _split_list(color_names),
+        _upload_stream(main_image) if main_image is not None and main_image.filename else None,
+        [_upload_stream(img) for img in color_images if img.filename],
+    )
+    width = -(-max(1, width) // PREVIEW_WIDTH_STEP) * PREVIEW_WIDTH_STEP
+    return await _build(_preview_response, product, max(PREVIEW_WIDTH_STEP, min(width, PREVIEW_MAX_WIDTH)), template_file)
 
-    colors = []
-    for i, img in enumerate(color_images):
-        color_name = color_name_list[i] if i < len(color_name_list) else ""
-        colors.append({"img": _to_bytes_file(img), "name": color_name})
 
-    product = {
-        "season_item": season_item,
-        "season_color": season_color,
-        "name": name,
-        "code": code,
-        "rrp": "",
-        "main_image": _to_bytes_file(main_image),
-        "logo": logo,
-        "artworks": artwork_list,
+def _split_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+
+def _parse_manifest(raw: bytes, filename: str) -> List[dict]:
+    try:
+        return parse_manifest(raw, filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+class _BatchImages:
+    def __init__(self, sources: Dict[str, Any], archive: Optional[zipfile.ZipFile] = None):
+        self._sources = sources
+        self._archive = archive
+        self._members: Dict[str, str] = {}
+        if archive is not None:
+            for member in archive.namelist():
+                if not member.endswith("/"):
+                    self._members.setdefault(Path(member).name, member)
+
+    def has(self, name: str) -> bool:
+        safe = Path(name).name
+        return safe in self._sources or safe in self._members
+
+    def open(self, name: str):
+        safe = Path(name).name
+        if safe in self._sources:
+            source = self._sources[safe]
+            if isinstance(source, str):
+                return source
+            source.seek(0)
+            return source
+        return io.BytesIO(self._archive.read(self._members[safe]))
+
+
+def _manifest_colors(row: dict) -> List[dict]:
+    if isinstance(row.get("colors"), list):
+        return [
+            {"name": str(c.get("name") or ""), "img": str(c.get("img") or "")}
+            for c in row["colors"]
+            if isinstance(c, dict)
+        ]
+    names = _split_list(row.get("color_names"))
+    images = _split_list(row.get("color_images"))
+    return [{"name": names[i] if i < len(names) else "", "img": img} for i, img in enumerate(images)]
+
+
+def _validate_manifest_row(row: Any, images: _BatchImages) -> Optional[str]:
+    if not isinstance(row, dict):
+        return "row must be an object"
+    if not str(row.get("code") or "").strip():
+        return "code is required"
+    colors = row.get("colors")
+    if colors not in (None, "") and not (isinstance(colors, list) and all(isinstance(c, dict) for c in colors)):
+        return "colors must be a list of objects"
+    main = str(row.get("main_image") or "").strip()
+    if main and not images.has(main):
+        return f"main_image not found: {main}"
+    for c in _manifest_colors(row):
+        if c["img"] and not images.has(c["img"]):
+            return f"color image not found: {c['img']}"
+    return None
+
+
+def _manifest_product(row: dict, images: _BatchImages) -> dict:
+    main = str(row.get("main_image") or "").strip()
+    colors = []
+    for c in _manifest_colors(row):
+        colors.append({"img": images.open(c["img"]) if c["img"] else None, "name": c["name"]})
+    return {
+        "season_item": str(row.get("season_item") or ""),
+        "season_color": str(row.get("season_color") or "#000000"),
+        "name": str(row.get("name") or ""),
+        "code": str(row.get("code") or ""),
+        "rrp": str(row.get("rrp") or ""),
+        "main_image": images.open(main) if main else None,
+        "logo": str(row.get("logo") or "선택 없음"),
+        "artworks": _split_list(row.get("artworks")),
         "colors": colors,
     }
 
-    ppt = generate_pptx(
-        products=[product],
-        template_file=TEMPLATE_FILE,
+
+def _iter_manifest_products(rows: List[dict], valid_rows: List[int], images: _BatchImages) -> Iterator[dict]:
+    for i in valid_rows:
+        yield _manifest_product(rows[i], images)
+
+
+def _open_archive(fileobj) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="archive is not a zip file")
+
+
+def _manifest_rows(manifest_raw: Optional[bytes], manifest_name: str, zf: Optional[zipfile.ZipFile]) -> List[dict]:
+    if manifest_raw is not None:
+        return _parse_manifest(manifest_raw, manifest_name or "manifest.json")
+    if zf is not None:
+        names = [n for n in zf.namelist() if Path(n).name.lower() in ("manifest.json", "manifest.jsonl", "manifest.csv")]
+        if not names:
+            raise HTTPException(status_code=400, detail="manifest not found in archive")
+        return _parse_manifest(zf.read(names[0]), names[0])
+    raise HTTPException(status_code=400, detail="manifest or archive is required")
+
+
+def _run_batch(
+    rows: List[dict],
+    images: _BatchImages,
+    progress=None,
+    previous=None,
+    prefetch: Optional[dict] = None,
+    template_file: str = TEMPLATE_FILE,
+):
+    errors = []
+    valid_rows = []
+    for i, row in enumerate(rows):
+        problem = _validate_manifest_row(row, images)
+        if problem:
+            errors.append({"row": i, "code": str(row.get("code", "")) if isinstance(row, dict) else "", "error": problem})
+        else:
+            valid_rows.append(i)
+
+    if prefetch is None:
+        with METRICS.span("github_sync"):
+            prefetch = _prefetch_assets(_product_assets([rows[i] for i in valid_rows]))
+
+    stats: Dict[str, Any] = {}
+    prs = build_pptx(
+        products=_iter_manifest_products(rows, valid_rows, images),
+        template_file=template_file,
         logo_dir=LOGO_DIR,
         artwork_dir=ARTWORK_DIR,
+        stats=stats,
+        skip_failed=True,
+        image_options=_image_options(),
+        workers=_generate_workers(),
+        progress=(lambda done, total: progress(done, len(valid_rows))) if progress else None,
+        incremental=DECK_MANIFEST,
+        previous=previous,
+    )
+    _record_build(stats)
+    for e in stats["errors"]:
+        errors.append({"row": valid_rows[e["index"]], "code": e["code"], "error": e["error"]})
+    errors.sort(key=lambda e: e["row"])
+
+    report = {
+        "products": len(rows),
+        "slides": stats["slides"],
+        "failed": len(errors),
+        "elapsed_s": stats["elapsed_s"],
+        "slides_per_s": stats["slides_per_s"],
+        "image_bytes_saved": stats.get("image_bytes_saved", 0),
+        "media_refs": stats.get("media_refs", 0),
+        "media_parts": stats.get("media_parts", 0),
+        "media_dedup_ratio": stats.get("media_dedup_ratio", 1.0),
+        "image_meta_hits": stats.get("image_meta_hits", 0),
+        "image_meta_misses": stats.get("image_meta_misses", 0),
+        "reused": stats.get("reused", 0),
+        "rebuilt": stats.get("rebuilt", 0),
+        "prefetch": prefetch,
+        "errors": errors,
+    }
+    return prs, report
+
+
+def _generate_batch_response(
+    rows: List[dict],
+    images: _BatchImages,
+    previous: Optional[UploadFile],
+    cache_key: Optional[str],
+    prefetch: dict,
+    template_file: str,
+    with_report: bool = False,
+):
+    prs, report = _run_batch(rows, images, previous=_previous_deck(previous), prefetch=prefetch, template_file=template_file)
+    if not report["slides"]:
+        return JSONResponse(report, status_code=422)
+
+    return _pptx_response(
+        prs,
+        "BOSS_Golf_LineSheet.pptx",
+        {
+            "X-Slides": str(report["slides"]),
+            "X-Failed": str(report["failed"]),
+            "X-Slides-Per-Second": str(report["slides_per_s"]),
+        },
+        cache_key,
+        report if with_report else None,
+    )
+
+
+@app.post("/api/generate/batch")
+async def generate_batch(
+    manifest: Optional[UploadFile] = File(default=None),
+    archive: Optional[UploadFile] = File(default=None),
+    files: List[UploadFile] = File(default=[]),
+    previous: Optional[UploadFile] = File(default=None),
+    template: str = Form(""),
+    report: bool = Form(False),
+    if_none_match: Optional[str] = Header(default=None),
+):
+    _check_upload_budget([manifest, archive, previous, *files])
+    template_file = await _io(_template_file, template)
+    zf = await _io(_open_archive, archive.file) if archive is not None else None
+    manifest_raw = await manifest.read() if manifest is not None else None
+    rows = await _io(_manifest_rows, manifest_raw, manifest.filename if manifest else "", zf)
+    sources = {Path(u.filename or "").name: u.file for u in files if u.filename}
+
+    assets = _product_assets([r for r in rows if isinstance(r, dict)])
+    with METRICS.span("github_sync"):
+        prefetch = await _io(_prefetch_assets, assets)
+    cache_key = None
+    if RESULT_CACHE is not None:
+        fields = {
+            "manifest": hashlib.sha256(manifest_raw or b"").hexdigest(),
+            "deck_manifest": DECK_MANIFEST,
+            "report": report,
+        }
+        uploads = {
+            "archive": await _upload_digest(archive),
+            "previous": await _upload_digest(previous),
+            "files": sorted([[Path(u.filename or "").name, await _upload_digest(u)] for u in files if u.filename]),
+        }
+        cache_key = await _io(_result_key, "generate_batch", fields, uploads, assets, template_file)
+        cached = await _io(_cached_response, cache_key, if_none_match)
+        if cached is not None:
+            return cached
+
+    return await _build(
+        _generate_batch_response, rows, _BatchImages(sources, zf), previous, cache_key, prefetch, template_file, report
+    )
+
+
+def _previous_deck(upload: Optional[UploadFile]):
+    if upload is None:
+        return None
+    try:
+        return Presentation(_upload_stream(upload))
+    except Exception:
+        raise HTTPException(status_code=400, detail="previous is not a readable .pptx")
+
+
+def _job_queue_full():
+    raise HTTPException(status_code=429, detail="job queue is full, retry later")
+
+
+def _spool_upload(upload: UploadFile, target: Path) -> str:
+    upload.file.seek(0)
+    with open(target, "wb") as out:
+        shutil.copyfileobj(upload.file, out, 1024 * 1024)
+    return str(target)
+
+
+def _spool_uploads(spools: List[tuple]) -> List[Optional[str]]:
+    return [_spool_upload(upload, target) if upload is not None else None for upload, target in spools]
+
+
+def _submit(job_id: str, job_dir: Path, run):
+    try:
+        JOBS.submit(job_id, job_dir, run)
+    except QueueFull:
+        _job_queue_full()
+    return JSONResponse({"job_id": job_id, "status_url": f"/api/jobs/{job_id}"}, status_code=202)
+
+
+def _save_job_result(prs, job_dir: Path) -> Path:
+    result = job_dir / "result.pptx"
+    with METRICS.span("save"):
+        _save_pptx(prs, str(result))
+    if METRICS.enabled:
+        METRICS.observe("deck_bytes", result.stat().st_size)
+    return result
+
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(
+    season_item: str = Form(""),
+    season_color: str = Form("#000000"),
+    name: str = Form(...),
+    code: str = Form(...),
+    logo: str = Form("선택 없음"),
+    artworks: str = Form(""),
+    color_names: str = Form(""),
+    template: str = Form(""),
+    main_image: UploadFile = File(...),
+    color_images: List[UploadFile] = File(default=[]),
+):
+    if not code.strip():
+        raise HTTPException(status_code=400, detail="code is required")
+    _check_upload_budget([main_image, *color_images])
+
+    template_file = await _io(_template_file, template)
+    job_id, job_dir = await _io(JOBS.new_job_dir)
+    spools = [(main_image, job_dir / "main")] + [(img, job_dir / f"color-{i}") for i, img in enumerate(color_images)]
+    paths = await _io(_spool_uploads, spools)
+    product = _form_product(
+        season_item,
+        season_color,
+        name,
+        code,
+        logo,
+        _split_list(artworks),
+        _split_list(color_names),
+        paths[0],
+        paths[1:],
     )
 
-    return StreamingResponse(
-        ppt,
-        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-        headers={"Content-Disposition": 'attachment; filename="BOSS_Golf_SpecSheet.pptx"'},
+    def run(progress):
+        with METRICS.span("github_sync"):
+            _prefetch_assets(_product_assets([product]))
+        prs, stats = _generate_single(product, progress, template_file)
+        return _save_job_result(prs, job_dir), {"filename": "BOSS_Golf_SpecSheet.pptx", "stats": stats}
+
+    return await _io(_submit, job_id, job_dir, run)
+
+
+@app.post("/api/jobs/batch", status_code=202)
+async def submit_batch_job(
+    manifest: Optional[UploadFile] = File(default=None),
+    archive: Optional[UploadFile] = File(default=None),
+    files: List[UploadFile] = File(default=[]),
+    previous: Optional[UploadFile] = File(default=None),
+    template: str = Form(""),
+):
+    if manifest is None and archive is None:
+        raise HTTPException(status_code=400, detail="manifest or archive is required")
+    _check_upload_budget([manifest, archive, previous, *files])
+    template_file = await _io(_template_file, template)
+
+    job_id, job_dir = await _io(JOBS.new_job_dir)
+    images_dir = job_dir / "images"
+    manifest_raw = await manifest.read() if manifest is not None else None
+    manifest_name = manifest.filename if manifest is not None else ""
+    named = [(Path(u.filename or "").name, u) for u in files]
+    named = [(safe, u) for safe, u in named if safe]
+    spools = [(archive, job_dir / "archive.zip"), (previous, job_dir / "previous.pptx")]
+    spools += [(u, images_dir / safe) for safe, u in named]
+    await _io(images_dir.mkdir)
+    archive_path, previous_path, *image_paths = await _io(_spool_uploads, spools)
+    sources = {safe: path for (safe, _), path in zip(named, image_paths)}
+
+    def run(progress):
+        zf = _open_archive(archive_path) if archive_path else None
+        try:
+            rows = _manifest_rows(manifest_raw, manifest_name, zf)
+            prs, report = _run_batch(rows, _BatchImages(sources, zf), progress, previous_path, template_file=template_file)
+        finally:
+            if zf is not None:
+                zf.close()
+        if not report["slides"]:
+            raise ValueError(f"no product could be built ({report['failed']} failed)")
+        return _save_job_result(prs, job_dir), {"filename": "BOSS_Golf_LineSheet.pptx", "report": report}
+
+    return await _io(_submit, job_id, job_dir, run)
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str):
+    status = JOBS.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    if status["status"] == "done":
+        status["result_url"] = f"/api/jobs/{job_id}/result"
+    return JSONResponse(status)
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def job_result(job_id: str):
+    job = JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    if job["status"] != "done":
+        raise HTTPException(status_code=409, detail=f"job is {job['status']}")
+    if not job["result"].exists():
+        raise HTTPException(status_code=410, detail="job result expired")
+    return FileResponse(
+        str(job["result"]),
+        media_type=PPTX_MEDIA_TYPE,
+        filename=job["info"].get("filename", "overview.pptx"),
     )
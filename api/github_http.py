@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import http.client
+import threading
+from typing import Dict, Optional, Tuple
+from urllib import parse
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class ConnectionPool:
+    def __init__(self, base_url: str, timeout: float = 20.0):
+        parts = parse.urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or "api.github.com"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def _send_once(self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]):
+        conn = self._connection()
+        try:
+            conn.request(method, self.prefix + path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except Exception:
+            self._reset()
+            raise
+        if resp.getheader("Connection", "").lower() == "close":
+            self._reset()
+        return resp.status, {k.lower(): v for k, v in resp.getheaders()}, data
+
+    def send(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        try:
+            return self._send_once(method, path, body, headers or {})
+        except http.client.CannotSendRequest:
+            return self._send_once(method, path, body, headers or {})
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # The request may have reached GitHub; only replay methods that are safe to repeat.
+            if method.upper() not in IDEMPOTENT_METHODS:
+                raise
+            return self._send_once(method, path, body, headers or {})
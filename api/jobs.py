@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, root: Path, workers: int = 2, max_pending: int = 16, ttl_s: int = 3600):
+        self.root = Path(root)
+        self.max_pending = max_pending
+        self.ttl_s = ttl_s
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="overviewmaker-job")
+        self._reaper: Optional[threading.Thread] = None
+
+    def new_job_dir(self) -> Tuple[str, Path]:
+        job_id = uuid.uuid4().hex
+        job_dir = self.root / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        return job_id, job_dir
+
+    def submit(self, job_id: str, job_dir: Path, fn: Callable[[Callable[..., None]], Tuple[Path, dict]]):
+        self.reap()
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j["status"] in ("queued", "running"))
+            if pending >= self.max_pending:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                raise QueueFull()
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "done": 0,
+                "total": None,
+                "created": time.time(),
+                "finished": None,
+                "error": None,
+                "result": None,
+                "info": {},
+                "dir": job_dir,
+            }
+        self._pool.submit(self._run, job_id, fn)
+        return job_id
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+
+    def _run(self, job_id: str, fn):
+        self._update(job_id, status="running", started=time.time())
+
+        def progress(done: int, total: Optional[int] = None):
+            self._update(job_id, done=done, total=total)
+
+        try:
+            result, info = fn(progress)
+        except Exception as e:
+            self._update(job_id, status="failed", error=f"{type(e).__name__}: {e}", finished=time.time())
+            return
+        self._update(job_id, status="done", result=Path(result), info=info or {}, finished=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job["finished"] is None or time.time() - job["finished"] <= self.ttl_s:
+                return dict(job)
+            del self._jobs[job_id]
+        shutil.rmtree(job["dir"], ignore_errors=True)
+        return None
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        expires = job["finished"] + self.ttl_s if job["finished"] else None
+        return {
+            "id": job["id"],
+            "status": job["status"],
+            "done": job["done"],
+            "total": job["total"],
+            "error": job["error"],
+            "info": job["info"],
+            "created": job["created"],
+            "finished": job["finished"],
+            "expires": expires,
+        }
+
+    def reap(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job["finished"] is not None and now - job["finished"] > self.ttl_s
+            ]
+            dirs = [self._jobs.pop(job_id)["dir"] for job_id in expired]
+            known = set(self._jobs)
+        if self.root.exists():
+            for job_dir in self.root.iterdir():
+                if job_dir.name not in known and now - job_dir.stat().st_mtime > self.ttl_s:
+                    dirs.append(job_dir)
+        for job_dir in dirs:
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+    def _reap_loop(self, interval: float):
+        while True:
+            time.sleep(interval)
+            try:
+                self.reap()
+            except Exception:
+                pass
+
+    def start(self, interval: float):
+        if self._reaper is None and interval > 0:
+            self._reaper = threading.Thread(target=self._reap_loop, args=(interval,), name="overviewmaker-jobs", daemon=True)
+            self._reaper.start()
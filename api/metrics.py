@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BYTES_BUCKETS = (64e3, 256e3, 1e6, 4e6, 16e6, 64e6, 256e6, 1e9)
+COUNT_BUCKETS = (1, 5, 10, 50, 100, 250, 500, 1000, 5000)
+
+_NULL_SPAN = contextlib.nullcontext()
+_CURRENT: contextvars.ContextVar[Optional["RequestTimer"]] = contextvars.ContextVar("overviewmaker_timer", default=None)
+
+
+def _labels_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: str = "") -> str:
+    parts = ['%s="%s"' % (k, v.replace("\\", "\\\\").replace('"', '\\"')) for k, v in key]
+    if extra:
+        parts.append(extra)
+    return "{%s}" % ",".join(parts) if parts else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metrics:
+    def __init__(self, enabled: bool, prefix: str = "overviewmaker"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._buckets: Dict[str, Tuple[float, ...]] = {}
+        self._histograms: Dict[str, Dict[tuple, List[Any]]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._collectors: List[Callable[[], List[Tuple[str, str, str, Dict[str, str], float]]]] = []
+
+    def histogram(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self._help[name] = ("histogram", help_text)
+        self._buckets[name] = tuple(buckets)
+        self._histograms.setdefault(name, {})
+
+    def counter(self, name: str, help_text: str):
+        self._help[name] = ("counter", help_text)
+        self._counters.setdefault(name, {})
+
+    def collector(self, fn: Callable[[], List[Tuple[str, str, str, Dict[str, str], float]]]):
+        self._collectors.append(fn)
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        buckets = self._buckets[name]
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._histograms[name].get(key)
+            if series is None:
+                series = self._histograms[name][key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def record_phase(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        self.observe("phase_seconds", seconds, phase=name)
+        timer = _CURRENT.get()
+        if timer is not None:
+            timer.add(name, seconds)
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextlib.contextmanager
+    def _span(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - started)
+
+    def mark_since_start(self, name: str):
+        timer = _CURRENT.get()
+        if timer is not None:
+            self.record_phase(name, time.perf_counter() - timer.started)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _labels_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, (kind, help_text) in self._help.items():
+                full = f"{self.prefix}_{name}"
+                lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                if kind == "counter":
+                    for key, value in self._counters[name].items():
+                        lines.append(f"{full}{_format_labels(key)} {_format_value(value)}")
+                    continue
+                bounds = ['le="%s"' % _format_value(b) for b in self._buckets[name]] + ['le="+Inf"']
+                for key, (counts, total, count) in self._histograms[name].items():
+                    running = 0
+                    for bound, n in zip(bounds, counts):
+                        running += n
+                        lines.append(f"{full}_bucket{_format_labels(key, bound)} {running}")
+                    lines.append(f"{full}_sum{_format_labels(key)} {_format_value(round(total, 6))}")
+                    lines.append(f"{full}_count{_format_labels(key)} {count}")
+        for fn in self._collectors:
+            seen = set()
+            for name, kind, help_text, labels, value in fn():
+                full = f"{self.prefix}_{name}"
+                if full not in seen:
+                    lines.append(f"# HELP {full} {help_text}")
+                    lines.append(f"# TYPE {full} {kind}")
+                    seen.add(full)
+                lines.append(f"{full}{_format_labels(_labels_key(labels))} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestTimer:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        parts = ["%s;dur=%.1f" % (name, seconds * 1000) for name, seconds in self.phases.items()]
+        parts.append("total;dur=%.1f" % ((time.perf_counter() - self.started) * 1000))
+        return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    def __init__(self, app, metrics: Metrics, server_timing: bool = True):
+        self.app = app
+        self.metrics = metrics
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timer = RequestTimer()
+        token = _CURRENT.set(timer)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                if self.server_timing:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timer.server_timing().encode("latin-1")))
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _CURRENT.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            elapsed = time.perf_counter() - timer.started
+            self.metrics.observe(
+                "request_duration_seconds",
+                elapsed,
+                route=route,
+                method=scope.get("method", ""),
+                status=str(status["code"]),
+            )
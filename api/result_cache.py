@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def _link_or_copy(src: Path, dst: Path):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _unlink_quietly(path: Path):
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+class ResultCache:
+    def __init__(self, root: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.root / f"{key}.pptx", self.root / f"{key}.json"
+
+    def _load(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        found = []
+        for path in self.root.iterdir():
+            if path.name.startswith("."):
+                _unlink_quietly(path)
+                continue
+            if path.suffix != ".pptx":
+                continue
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime, path.stem, st.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._bytes += size
+        with self._lock:
+            self._evict()
+
+    def _drop(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+        for path in self._paths(key):
+            _unlink_quietly(path)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._drop(key)
+            self.evictions += 1
+
+    def checkout(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            pptx, meta = self._paths(key)
+            serving = self.root / f".serving-{uuid.uuid4().hex}.pptx"
+            try:
+                headers = json.loads(meta.read_text(encoding="utf-8"))
+                _link_or_copy(pptx, serving)
+                os.utime(pptx)
+            except (OSError, ValueError):
+                self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return str(serving), headers
+
+    def put(self, key: str, path: str, headers: Dict[str, Any]):
+        size = os.path.getsize(path)
+        if size > self.max_bytes:
+            return
+        pptx, meta = self._paths(key)
+        tmp = self.root / f".tmp-{uuid.uuid4().hex}"
+        try:
+            _link_or_copy(Path(path), tmp)
+            meta.write_text(json.dumps(headers), encoding="utf-8")
+            os.replace(tmp, pptx)
+        except OSError:
+            _unlink_quietly(tmp)
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old
+            self._entries[key] = size
+            self._bytes += size
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TEMPLATE_SUFFIX = ".pptx"
+
+
+class UnknownTemplate(KeyError):
+    pass
+
+
+class InvalidTemplate(ValueError):
+    pass
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class TemplateRegistry:
+    def __init__(
+        self,
+        root: Path,
+        default: str,
+        preload: Callable[[str], Dict[str, Any]],
+        evict: Callable[[str], None],
+        layout_suffix: str = ".layout.json",
+    ):
+        self.root = Path(root)
+        self.default = default
+        self._preload = preload
+        self._evict = evict
+        self._layout_suffix = layout_suffix
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._templates: Dict[str, Dict[str, Any]] = {}
+        self._loaded = False
+        self._watcher: Optional[threading.Thread] = None
+        self.loads = 0
+        self.failed = 0
+        self.removed = 0
+
+    def _scan(self) -> Dict[str, Path]:
+        if not self.root.is_dir():
+            return {}
+        return {
+            p.stem: p
+            for p in sorted(self.root.iterdir())
+            if p.suffix.lower() == TEMPLATE_SUFFIX and p.is_file() and not p.name.startswith(("~$", "."))
+        }
+
+    def _file_key(self, path: Path):
+        return (_stat_key(path), _stat_key(path.with_suffix(self._layout_suffix)))
+
+    def _load(self, template_id: str, path: Path, key) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"id": template_id, "file": str(path), "key": key}
+        started = time.perf_counter()
+        try:
+            info.update(self._preload(str(path)))
+            info["ok"], info["error"] = True, None
+        except Exception as e:
+            info["ok"], info["error"] = False, f"{type(e).__name__}: {e}"
+        info["load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return info
+
+    def refresh(self) -> List[str]:
+        with self._refresh_lock:
+            with self._lock:
+                templates = dict(self._templates)
+            found = self._scan()
+            changed = []
+            for template_id, path in found.items():
+                key = self._file_key(path)
+                entry = templates.get(template_id)
+                if entry is not None and entry["key"] == key and entry["file"] == str(path):
+                    continue
+                templates[template_id] = self._load(template_id, path, key)
+                changed.append(template_id)
+            removed = [template_id for template_id in templates if template_id not in found]
+            for template_id in removed:
+                self._evict(templates.pop(template_id)["file"])
+            with self._lock:
+                self._templates = templates
+                self._loaded = True
+                self.loads += len(changed)
+                self.failed += sum(1 for template_id in changed if not templates[template_id]["ok"])
+                self.removed += len(removed)
+            return changed + removed
+
+    def _watch(self, interval: float):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            if interval <= 0:
+                return
+            time.sleep(interval)
+
+    def start(self, interval: float):
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), name="overviewmaker-templates", daemon=True)
+            self._watcher.start()
+
+    def _lookup(self, template_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._templates.get(template_id)
+
+    def resolve(self, template_id: Optional[str] = None) -> Dict[str, Any]:
+        template_id = (template_id or "").strip() or self.default
+        if not self._loaded:
+            self.refresh()
+        entry = self._lookup(template_id)
+        if entry is None:
+            self.refresh()
+            entry = self._lookup(template_id)
+        if entry is None:
+            raise UnknownTemplate(template_id)
+        if not entry["ok"]:
+            raise InvalidTemplate(f"{template_id}: {entry['error']}")
+        return entry
+
+    def listing(self) -> List[Dict[str, Any]]:
+        if not self._loaded:
+            self.refresh()
+        with self._lock:
+            entries = sorted(self._templates.values(), key=lambda e: e["id"])
+        return [
+            {**{k: v for k, v in entry.items() if k not in ("key", "file")}, "default": entry["id"] == self.default}
+            for entry in entries
+        ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "invalid": sum(1 for entry in self._templates.values() if not entry["ok"]),
+                "loads": self.loads,
+                "failed": self.failed,
+                "removed": self.removed,
+            }
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+THUMB_SIZES = (64, 128, 256, 512)
+THUMB_FORMATS = {"webp": ("WEBP", "image/webp"), "png": ("PNG", "image/png")}
+
+
+class ThumbnailCache:
+    def __init__(self, root: Path, digest: Callable[[Path], Optional[str]], workers: int = 1):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._digest = digest
+        self._lock = threading.Lock()
+        self._building: Dict[str, threading.Lock] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="overviewmaker-thumb")
+        self.hits = 0
+        self.generated = 0
+        self.failed = 0
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._building.setdefault(key, threading.Lock())
+
+    def _render(self, source: Path, target: Path, size: int, fmt: str):
+        with Image.open(source) as img:
+            if img.format == "JPEG":
+                img.draft("RGB", (size, size))
+            img = ImageOps.exif_transpose(img)
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+            img = img.convert("RGBA" if has_alpha else "RGB")
+            img.thumbnail((size, size), Image.LANCZOS)
+            tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+            try:
+                if fmt == "webp":
+                    img.save(tmp, "WEBP", quality=82, method=4)
+                else:
+                    img.save(tmp, "PNG", optimize=True)
+                os.replace(tmp, target)
+            except Exception:
+                tmp.unlink(missing_ok=True)
+                raise
+
+    def get(self, source: Path, size: int, fmt: str) -> Optional[Tuple[Path, str]]:
+        try:
+            digest = self._digest(source)
+        except Exception:
+            digest = None
+        if digest is None:
+            return None
+        key = f"{digest}-{size}"
+        target = self.root / f"{key}.{fmt}"
+        if target.exists():
+            with self._lock:
+                self.hits += 1
+            return target, key
+        with self._key_lock(f"{key}.{fmt}"):
+            if not target.exists():
+                try:
+                    self._render(source, target, size, fmt)
+                except Exception:
+                    with self._lock:
+                        self.failed += 1
+                    return None
+                with self._lock:
+                    self.generated += 1
+        with self._lock:
+            self._building.pop(f"{key}.{fmt}", None)
+        return target, key
+
+    def pregenerate(self, sources: Iterable[Path], sizes: Iterable[int], formats: Iterable[str]):
+        jobs = [(Path(s), size, fmt) for s in sources for size in sizes for fmt in formats]
+        for source, size, fmt in jobs:
+            self._pool.submit(self.get, source, size, fmt)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "generated": self.generated, "failed": self.failed}
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import io
+import socket
+import uuid
+from typing import Dict, List, Tuple
+
+from PIL import Image
+
+
+def jpeg(width: int, height: int, seed: int, quality: int = 90) -> bytes:
+    img = Image.effect_noise((width, height), 40 + seed % 20).convert("RGB")
+    buff = io.BytesIO()
+    img.save(buff, "JPEG", quality=quality)
+    return buff.getvalue()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def multipart(fields: Dict[str, str], files: List[tuple]) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    out = io.BytesIO()
+    for name, value in fields.items():
+        out.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8"))
+    for name, filename, blob in files:
+        out.write(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: image/jpeg\r\n\r\n".encode("utf-8")
+        )
+        out.write(blob)
+        out.write(b"\r\n")
+    out.write(f"--{boundary}--\r\n".encode("utf-8"))
+    return out.getvalue(), f"multipart/form-data; boundary={boundary}"
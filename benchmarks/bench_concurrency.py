@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import argparse
+import base64
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List
+
+from _util import free_port, jpeg, multipart
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _slow_github(delay: float) -> ThreadingHTTPServer:
+    names = [f"art-{i}.png" for i in range(20)]
+    listing = json.dumps([{"name": n, "path": f"assets/artworks/{n}", "sha": n} for n in names])
+    modes = json.dumps({n: "default" for n in names}).encode("utf-8")
+    meta = json.dumps({"name": "_meta.json", "content": base64.b64encode(modes).decode("ascii"), "sha": "m"})
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(delay)
+            body = (meta if self.path.endswith("_meta.json") else listing).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _client(port: int, method: str, path: str, body, content_type, deadline: float, results: list):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+    headers = {"Content-Type": content_type} if content_type else {}
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+            status = 0
+        results.append((status, time.perf_counter() - started))
+        if status == 429:
+            time.sleep(0.05)
+    conn.close()
+
+
+def _wait_ready(port: int, proc: subprocess.Popen):
+    for _ in range(300):
+        if proc.poll() is not None:
+            raise SystemExit("server exited during startup")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit("server did not start")
+
+
+def _report(label: str, results: list, seconds: float):
+    ok = [elapsed for status, elapsed in results if status == 200]
+    busy = sum(1 for status, _ in results if status == 429)
+    errors = len(results) - len(ok) - busy
+    print(
+        f"{label:<10} {len(ok):>6} {len(ok) / seconds:>8.2f} {_percentile(ok, 0.5) * 1000:>9.0f} "
+        f"{_percentile(ok, 0.95) * 1000:>9.0f} {busy:>6} {errors:>6}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test /api/generate while slow GitHub-backed listing requests compete for the server."
+    )
+    parser.add_argument("--root", default=str(ROOT), help="checkout to serve (compare against an older worktree)")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--generate-clients", type=int, default=8)
+    parser.add_argument("--github-clients", type=int, default=64)
+    parser.add_argument("--github-delay", type=float, default=1.0, help="seconds the fake GitHub API waits per call")
+    parser.add_argument("--image-px", type=int, default=1600)
+    parser.add_argument("--colors", type=int, default=3)
+    args = parser.parse_args()
+
+    github = _slow_github(args.github_delay)
+    port = free_port()
+    env = dict(
+        os.environ,
+        GITHUB_TOKEN="bench",
+        GITHUB_REPO="bench/assets",
+        GITHUB_API_URL=f"http://127.0.0.1:{github.server_port}",
+        GITHUB_CACHE_TTL="0",
+        RESULT_CACHE="0",
+        PYTHONPATH=args.root,
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.generate:app", "--port", str(port), "--log-level", "warning"],
+        cwd=args.root,
+        env=env,
+    )
+    try:
+        _wait_ready(port, proc)
+        image = jpeg(args.image_px, args.image_px * 3 // 4, 0)
+        files = [("main_image", "main.jpg", image)]
+        files += [("color_images", f"c{i}.jpg", image) for i in range(args.colors)]
+        fields = {"name": "POLO SHIRT", "code": "BG00001", "color_names": ",".join(f"C{i}" for i in range(args.colors))}
+        body, content_type = multipart(fields, files)
+
+        generated: list = []
+        listed: list = []
+        deadline = time.perf_counter() + args.seconds
+        threads = [
+            threading.Thread(target=_client, args=(port, "POST", "/api/generate", body, content_type, deadline, generated))
+            for _ in range(args.generate_clients)
+        ]
+        threads += [
+            threading.Thread(target=_client, args=(port, "GET", "/api/assets?kind=artworks", None, None, deadline, listed))
+            for _ in range(args.github_clients)
+        ]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        print(
+            f"{args.generate_clients} generate clients, {args.github_clients} listing clients, "
+            f"GitHub delay {args.github_delay}s, {elapsed:.1f}s"
+        )
+        print(f"{'route':<10} {'ok':>6} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'429':>6} {'errors':>6}")
+        _report("generate", generated, elapsed)
+        _report("assets", listed, elapsed)
+    finally:
+        proc.terminate()
+        proc.wait()
+        github.shutdown()
+
+
+if __name__ == "__main__":
+    main()
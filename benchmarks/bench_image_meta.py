@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ppt_engine  # noqa: E402
+
+
+def _assets(root: Path, logos: int, artworks: int, image_px: int):
+    logo_dir = root / "logos"
+    artwork_dir = root / "artworks"
+    logo_dir.mkdir()
+    artwork_dir.mkdir()
+    for i in range(logos):
+        img = Image.effect_noise((image_px, image_px // 3), 30 + i).convert("RGBA")
+        img.save(logo_dir / f"logo-{i}.png", dpi=(300, 300))
+    for i in range(artworks):
+        img = Image.effect_noise((image_px // 2, image_px // 2), 30 + i).convert("RGB")
+        img.save(artwork_dir / f"art-{i}.png")
+    return str(logo_dir), str(artwork_dir)
+
+
+def _products(count: int, logos: int, artworks: int, per_slide: int):
+    return [
+        {
+            "name": "POLO SHIRT",
+            "code": f"BG{i:05d}",
+            "logo": f"logo-{i % logos}.png",
+            "artworks": [f"art-{(i + a) % artworks}.png" for a in range(per_slide)],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure logo/artwork placement with and without the image metadata cache.")
+    parser.add_argument("--slides", type=int, default=300)
+    parser.add_argument("--logos", type=int, default=4)
+    parser.add_argument("--artworks", type=int, default=8)
+    parser.add_argument("--per-slide", type=int, default=3)
+    parser.add_argument("--image-px", type=int, default=1500)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_dir, artwork_dir = _assets(Path(tmp), args.logos, args.artworks, args.image_px)
+        products = _products(args.slides, args.logos, args.artworks, args.per_slide)
+        kwargs = {"template_file": str(ROOT / "template.pptx"), "logo_dir": logo_dir, "artwork_dir": artwork_dir}
+        ppt_engine.build_pptx(products[:1], **kwargs)
+        pictures = args.slides * (1 + args.per_slide)
+
+        print(f"{'cache':<8} {'seconds':>8} {'pictures/s':>11} {'hits':>6} {'misses':>7}")
+        for label in ("cold", "disk", "memory"):
+            best = None
+            for _ in range(args.rounds):
+                if label != "memory":
+                    ppt_engine.clear_image_meta_cache()
+                if label == "cold":
+                    for folder in (logo_dir, artwork_dir):
+                        Path(ppt_engine.image_meta_file(folder)).unlink(missing_ok=True)
+                stats = {}
+                started = time.perf_counter()
+                ppt_engine.build_pptx(products, stats=stats, **kwargs)
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            print(
+                f"{label:<8} {best:>8.3f} {pictures / best:>11.0f} "
+                f"{stats['image_meta_hits']:>6} {stats['image_meta_misses']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+from _util import jpeg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ppt_engine import generate_pptx  # noqa: E402
+
+
+def _products(count: int, colors: int, images, changed: int):
+    return [
+        {
+            "season_item": "SS26",
+            "name": "POLO SHIRT",
+            "code": f"BG{i:05d}",
+            "rrp": "149,000" if i < changed else "129,000",
+            "main_image": io.BytesIO(images[i % len(images)]),
+            "logo": "boss-logo-camel.png",
+            "artworks": ["line-3colors.png"],
+            "colors": [{"img": io.BytesIO(images[(i + c + 1) % len(images)]), "name": f"COLOR {c + 1}"} for c in range(colors)],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare a full rebuild with incremental regeneration.")
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--colors", type=int, default=3)
+    parser.add_argument("--image-px", type=int, default=1200)
+    parser.add_argument("--changed", default="0,1,10,50")
+    args = parser.parse_args()
+
+    images = [jpeg(args.image_px, args.image_px * 3 // 4, i) for i in range(12)]
+    kwargs = {
+        "template_file": str(ROOT / "template.pptx"),
+        "logo_dir": str(ROOT / "assets" / "logos"),
+        "artwork_dir": str(ROOT / "assets" / "artworks"),
+        "image_options": {},
+    }
+    started = time.perf_counter()
+    previous = generate_pptx(_products(args.slides, args.colors, images, 0), incremental=True, **kwargs).getvalue()
+    full = time.perf_counter() - started
+    print(f"full build of {args.slides} slides: {full:.3f}s")
+
+    print(f"{'changed':>7} {'seconds':>8} {'reused':>7} {'rebuilt':>8} {'vs full':>8}")
+    for changed in (int(v) for v in args.changed.split(",")):
+        stats = {}
+        started = time.perf_counter()
+        generate_pptx(
+            _products(args.slides, args.colors, images, changed),
+            previous=io.BytesIO(previous),
+            stats=stats,
+            **kwargs,
+        )
+        elapsed = time.perf_counter() - started
+        print(f"{changed:>7} {elapsed:>8.3f} {stats['reused']:>7} {stats['rebuilt']:>8} {full / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
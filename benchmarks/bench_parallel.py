@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+
+from _util import jpeg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from ppt_engine import generate_pptx  # noqa: E402
+
+
+def _products(count: int, colors: int, image_px: int):
+    main = [jpeg(image_px, image_px * 3 // 4, i) for i in range(4)]
+    swatch = [jpeg(image_px // 2, image_px // 2, i) for i in range(4)]
+    return [
+        {
+            "season_item": "SS26",
+            "name": "POLO SHIRT",
+            "code": f"BG{i:05d}",
+            "main_image": main[i % len(main)],
+            "logo": "boss-logo-camel.png",
+            "artworks": ["line-3colors.png"],
+            "colors": [{"img": swatch[(i + c) % len(swatch)], "name": f"COLOR {c + 1}"} for c in range(colors)],
+        }
+        for i in range(count)
+    ]
+
+
+def _streams(products):
+    return [
+        dict(p, main_image=io.BytesIO(p["main_image"]), colors=[dict(c, img=io.BytesIO(c["img"])) for c in p["colors"]])
+        for p in products
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure generate_pptx scaling across worker processes.")
+    parser.add_argument("--slides", type=int, default=200)
+    parser.add_argument("--colors", type=int, default=4)
+    parser.add_argument("--image-px", type=int, default=2000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-normalize", action="store_true")
+    args = parser.parse_args()
+
+    products = _products(args.slides, args.colors, args.image_px)
+    image_options = None if args.no_normalize else {}
+    kwargs = {
+        "template_file": str(ROOT / "template.pptx"),
+        "logo_dir": str(ROOT / "assets" / "logos"),
+        "artwork_dir": str(ROOT / "assets" / "artworks"),
+        "image_options": image_options,
+    }
+    generate_pptx(_streams(products[:1]), **kwargs)
+
+    baseline = None
+    print(f"{'workers':>7} {'seconds':>9} {'slides/s':>9} {'speedup':>8} {'bytes':>11}")
+    workers = 1
+    while workers <= args.max_workers:
+        items = _streams(products)
+        started = time.perf_counter()
+        out = generate_pptx(items, workers=workers, **kwargs)
+        elapsed = time.perf_counter() - started
+        baseline = baseline or elapsed
+        size = len(out.getvalue())
+        print(f"{workers:>7} {elapsed:>9.3f} {args.slides / elapsed:>9.1f} {baseline / elapsed:>7.2f}x {size:>11}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
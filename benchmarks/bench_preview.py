@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+from _util import jpeg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ppt_engine  # noqa: E402
+
+
+def _product(images, colors: int, name: str):
+    return {
+        "season_item": "JETSET LUXE",
+        "name": name,
+        "code": "BG00001",
+        "logo": "boss-logo-camel.png",
+        "artworks": ["line-3colors.png"],
+        "main_image": io.BytesIO(images[0]),
+        "colors": [{"img": io.BytesIO(images[1 + c]), "name": f"COLOR {c + 1}"} for c in range(colors)],
+    }
+
+
+def _render(images, args, name: str):
+    started = time.perf_counter()
+    img = ppt_engine.render_preview(
+        _product(images, args.colors, name),
+        template_file=str(ROOT / "template.pptx"),
+        logo_dir=str(ROOT / "assets" / "logos"),
+        artwork_dir=str(ROOT / "assets" / "artworks"),
+        width=args.width,
+    )
+    rendered = time.perf_counter()
+    img.save(io.BytesIO(), "PNG", compress_level=1)
+    return rendered - started, time.perf_counter() - rendered
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time render_preview() for a first render and for re-renders after edits.")
+    parser.add_argument("--width", type=int, default=960)
+    parser.add_argument("--colors", type=int, default=4)
+    parser.add_argument("--image-px", type=int, default=3000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    images = [jpeg(args.image_px, args.image_px * 4 // 3, i) for i in range(args.colors + 1)]
+    render, encode = _render(images, args, "POLO SHIRT")
+    print(f"{args.width}px preview, {args.colors} colors, {args.image_px}px photos")
+    print(f"{'run':<10} {'render ms':>10} {'png ms':>8}")
+    print(f"{'cold':<10} {render * 1000:>10.1f} {encode * 1000:>8.1f}")
+    timings = [_render(images, args, f"POLO SHIRT {i}") for i in range(args.rounds)]
+    render = sorted(t[0] for t in timings)[len(timings) // 2]
+    encode = sorted(t[1] for t in timings)[len(timings) // 2]
+    print(f"{'warm p50':<10} {render * 1000:>10.1f} {encode * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+from _util import jpeg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ppt_engine  # noqa: E402
+
+MODES = [
+    ("prs.save", None),
+    ("stored", {"media_level": 0, "xml_level": 0}),
+    ("fast", {"media_level": 0, "xml_level": 1}),
+    ("default", {"media_level": 0, "xml_level": 6}),
+    ("small", {"media_level": 6, "xml_level": 9}),
+    ("no-reuse", {"media_level": 0, "xml_level": 6, "reuse_template": False}),
+]
+
+
+def _products(count: int, colors: int, images):
+    return [
+        {
+            "name": "POLO SHIRT",
+            "code": f"BG{i:05d}",
+            "logo": "boss-logo-camel.png",
+            "artworks": ["line-3colors.png"],
+            "main_image": io.BytesIO(images[i % len(images)]),
+            "colors": [{"img": io.BytesIO(images[(i * colors + c) % len(images)]), "name": f"COLOR {c + 1}"} for c in range(colors)],
+        }
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare save time and file size of prs.save() and save_pptx() levels.")
+    parser.add_argument("--slides", type=int, default=100)
+    parser.add_argument("--colors", type=int, default=3)
+    parser.add_argument("--images", type=int, default=200, help="distinct photos in the pool")
+    parser.add_argument("--image-px", type=int, default=1600)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    images = [jpeg(args.image_px, args.image_px * 3 // 4, i) for i in range(args.images)]
+    prs = ppt_engine.build_pptx(_products(args.slides, args.colors, images), template_file=str(ROOT / "template.pptx"))
+    print(f"{args.slides} slides, {len(images)} photos of {args.image_px}px")
+    print(f"{'mode':<10} {'seconds':>8} {'MB':>8} {'MB/s':>8}")
+    for label, options in MODES:
+        best = None
+        for _ in range(args.rounds):
+            out = io.BytesIO()
+            started = time.perf_counter()
+            if options is None:
+                prs.save(out)
+            else:
+                ppt_engine.save_pptx(prs, out, **options)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        size = len(out.getvalue()) / 1e6
+        print(f"{label:<10} {best:>8.3f} {size:>8.2f} {size / best:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
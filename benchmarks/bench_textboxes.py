@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import ppt_engine  # noqa: E402
+from ppt_engine import TEXT_SPECS  # noqa: E402
+
+
+def _shapes_per_second(add, count: int, per_slide: int) -> float:
+    prs, layout, _ = ppt_engine._open_template(str(ROOT / "template.pptx"))
+    slide = prs.slides.add_slide(layout)
+    started = time.perf_counter()
+    for i in range(count):
+        if i and i % per_slide == 0:
+            slide = prs.slides.add_slide(layout)
+        add(slide, i)
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare text box shapes/second: python-pptx setters vs precompiled XML.")
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--per-slide", type=int, default=12)
+    args = parser.parse_args()
+
+    cases = {
+        "spec (category)": (
+            lambda s, i: ppt_engine._build_text_by_spec(s, f"CODE {i}", TEXT_SPECS["category"]),
+            lambda s, i: ppt_engine._add_text_by_spec(s, f"CODE {i}", TEXT_SPECS["category"]),
+        ),
+        "spec (season, color)": (
+            lambda s, i: ppt_engine._build_text_by_spec(s, "SS26", TEXT_SPECS["season"], "#987147"),
+            lambda s, i: ppt_engine._add_text_by_spec(s, "SS26", TEXT_SPECS["season"], "#987147"),
+        ),
+        "colorway label": (
+            lambda s, i: ppt_engine._build_text_at(s, f"①NAVY {i}", 169.9 + i % 3, 114.8, 32.0, 5.0),
+            lambda s, i: ppt_engine._add_text_at(s, f"①NAVY {i}", 169.9 + i % 3, 114.8, 32.0, 5.0),
+        ),
+    }
+    print(f"{'case':<22} {'setters/s':>10} {'compiled/s':>11} {'speedup':>8}")
+    for name, (slow, fast) in cases.items():
+        slow_rate = _shapes_per_second(slow, args.count, args.per_slide)
+        fast_rate = _shapes_per_second(fast, args.count, args.per_slide)
+        print(f"{name:<22} {slow_rate:>10.0f} {fast_rate:>11.0f} {fast_rate / slow_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
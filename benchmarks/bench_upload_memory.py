@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib import request
+
+from _util import free_port, jpeg, multipart
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _peak_rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Peak server RSS for POST /api/generate with large uploads.")
+    parser.add_argument("--colors", type=int, default=10)
+    parser.add_argument("--image-px", type=int, default=4000)
+    parser.add_argument("--requests", type=int, default=3)
+    args = parser.parse_args()
+
+    images = [jpeg(args.image_px, args.image_px * 3 // 4, i, quality=95) for i in range(args.colors + 1)]
+    files = [("main_image", "main.jpg", images[0])]
+    files += [("color_images", f"c{i}.jpg", images[i + 1]) for i in range(args.colors)]
+    fields = {"name": "POLO", "code": "BG00001", "color_names": ",".join(f"C{i}" for i in range(args.colors))}
+    body, content_type = multipart(fields, files)
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.generate:app", "--port", str(port), "--log-level", "warning"],
+        cwd=str(ROOT),
+        env=dict(os.environ, PYTHONPATH=str(ROOT)),
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                request.urlopen(f"{url}/health", timeout=1).read()
+                break
+            except OSError:
+                time.sleep(0.1)
+        idle_mb = _peak_rss_mb(server.pid)
+        started = time.perf_counter()
+        for _ in range(args.requests):
+            req = request.Request(f"{url}/api/generate", data=body, headers={"Content-Type": content_type})
+            with request.urlopen(req, timeout=600) as resp:
+                deck = resp.read()
+        elapsed = (time.perf_counter() - started) / args.requests
+        peak_mb = _peak_rss_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print(f"uploads per request: {len(body) / 1e6:.1f} MB ({len(files)} images)")
+    print(f"deck size: {len(deck) / 1e6:.1f} MB, {elapsed:.2f} s/request")
+    print(f"server peak RSS: {peak_mb:.1f} MB (idle {idle_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
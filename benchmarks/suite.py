@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from PIL import Image
+
+from _util import jpeg
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+BASE = {"kind": "engine", "slides": 20, "colors": 4, "artworks": 1, "image_px": 1200, "workers": 1, "normalize": True}
+
+PRESETS = {
+    "quick": {
+        "slides": [1, 20, 100],
+        "colors": [1, 3, 10],
+        "artworks": [0, 3],
+        "image_px": [600, 2400],
+        "api": [{"kind": "api", "slides": 1}, {"kind": "api-batch", "slides": 20}],
+    },
+    "full": {
+        "slides": [1, 10, 100, 1000],
+        "colors": [1, 2, 3, 5, 10],
+        "artworks": [0, 1, 3],
+        "image_px": [600, 1200, 3000],
+        "api": [{"kind": "api", "slides": 1}, {"kind": "api-batch", "slides": 100}],
+    },
+}
+
+IMAGE_POOL = 8
+
+
+def _scenarios(preset: str) -> List[Dict[str, Any]]:
+    spec = PRESETS[preset]
+    out: Dict[str, Dict[str, Any]] = {}
+    for key in ("slides", "colors", "artworks", "image_px"):
+        for value in spec[key]:
+            scenario = dict(BASE, **{key: value})
+            out.setdefault(_name(scenario), scenario)
+    for extra in spec["api"]:
+        scenario = dict(BASE, **extra)
+        out.setdefault(_name(scenario), scenario)
+    return list(out.values())
+
+
+def _name(s: Dict[str, Any]) -> str:
+    return f"{s['kind']}/slides={s['slides']}/colors={s['colors']}/artworks={s['artworks']}/px={s['image_px']}"
+
+
+def _assets(root: Path, count: int):
+    logo_dir = root / "logos"
+    artwork_dir = root / "artworks"
+    logo_dir.mkdir()
+    artwork_dir.mkdir()
+    Image.effect_noise((900, 300), 50).convert("RGBA").save(logo_dir / "logo.png")
+    modes = {}
+    for i in range(max(count, 1)):
+        size = [(400, 600), (900, 300), (300, 300)][i % 3]
+        Image.effect_noise(size, 30 + i).convert("RGB").save(artwork_dir / f"art-{i}.png")
+        modes[f"art-{i}.png"] = ["default", "horizontal", "small"][i % 3]
+    (artwork_dir / "_meta.json").write_text(json.dumps(modes), encoding="utf-8")
+    return str(logo_dir), str(artwork_dir)
+
+
+def _products(s: Dict[str, Any], images: List[bytes]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "season_item": "SS26",
+            "season_color": "#987147",
+            "name": "POLO SHIRT",
+            "code": f"BG{i:05d}",
+            "rrp": "129,000",
+            "main_image": io.BytesIO(images[i % len(images)]),
+            "logo": "logo.png",
+            "artworks": [f"art-{a}.png" for a in range(s["artworks"])],
+            "colors": [
+                {"img": io.BytesIO(images[(i + c + 1) % len(images)]), "name": f"COLOR {c + 1}"}
+                for c in range(s["colors"])
+            ],
+        }
+        for i in range(s["slides"])
+    ]
+
+
+def _run_engine(s: Dict[str, Any], images: List[bytes], repeat: int) -> Dict[str, Any]:
+    from ppt_engine import generate_pptx
+
+    with tempfile.TemporaryDirectory() as tmp:
+        logo_dir, artwork_dir = _assets(Path(tmp), s["artworks"])
+        runs = []
+        for _ in range(repeat):
+            stats: Dict[str, Any] = {}
+            products = _products(s, images)
+            started = time.perf_counter()
+            out = generate_pptx(
+                products,
+                template_file=str(ROOT / "template.pptx"),
+                logo_dir=logo_dir,
+                artwork_dir=artwork_dir,
+                stats=stats,
+                image_options={} if s["normalize"] else None,
+                workers=s["workers"],
+            )
+            runs.append({"seconds": time.perf_counter() - started, "bytes": len(out.getvalue()), "stats": stats})
+    best = min(runs, key=lambda r: r["seconds"])
+    return {
+        "first_s": round(runs[0]["seconds"], 4),
+        "best_s": round(best["seconds"], 4),
+        "slides_per_s": round(s["slides"] / best["seconds"], 2),
+        "bytes": best["bytes"],
+        "phases": best["stats"].get("phases", {}),
+        "first_phases": runs[0]["stats"].get("phases", {}),
+        "media_parts": best["stats"].get("media_parts"),
+    }
+
+
+def _run_api(s: Dict[str, Any], images: List[bytes], repeat: int) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    from api.generate import app
+
+    client = TestClient(app)
+    runs = []
+    for _ in range(repeat):
+        if s["kind"] == "api":
+            files = [("main_image", ("main.jpg", images[0], "image/jpeg"))]
+            files += [("color_images", (f"c{c}.jpg", images[(c + 1) % len(images)], "image/jpeg")) for c in range(s["colors"])]
+            data = {
+                "name": "POLO SHIRT",
+                "code": "BG00001",
+                "logo": "boss-logo-camel.png",
+                "artworks": ",".join(["line-3colors.png"] * s["artworks"]),
+                "color_names": ",".join(f"COLOR {c + 1}" for c in range(s["colors"])),
+            }
+            started = time.perf_counter()
+            resp = client.post("/api/generate", data=data, files=files)
+        else:
+            rows = [
+                {
+                    "name": "POLO SHIRT",
+                    "code": f"BG{i:05d}",
+                    "logo": "boss-logo-camel.png",
+                    "artworks": ["line-3colors.png"] * s["artworks"],
+                    "main_image": f"img{i % len(images)}.jpg",
+                    "colors": [{"name": f"COLOR {c + 1}", "img": f"img{(i + c + 1) % len(images)}.jpg"} for c in range(s["colors"])],
+                }
+                for i in range(s["slides"])
+            ]
+            files = [("manifest", ("manifest.json", json.dumps(rows).encode(), "application/json"))]
+            files += [("files", (f"img{i}.jpg", blob, "image/jpeg")) for i, blob in enumerate(images)]
+            started = time.perf_counter()
+            resp = client.post("/api/generate/batch", files=files)
+        elapsed = time.perf_counter() - started
+        resp.raise_for_status()
+        runs.append({"seconds": elapsed, "bytes": len(resp.content)})
+    best = min(runs, key=lambda r: r["seconds"])
+    return {
+        "first_s": round(runs[0]["seconds"], 4),
+        "best_s": round(best["seconds"], 4),
+        "slides_per_s": round(s["slides"] / best["seconds"], 2),
+        "bytes": best["bytes"],
+    }
+
+
+def _run_scenario(s: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    pool = min(IMAGE_POOL, s["slides"] * (s["colors"] + 1))
+    images = [jpeg(s["image_px"], s["image_px"] * 3 // 4, i) for i in range(pool)]
+    runner = _run_engine if s["kind"] == "engine" else _run_api
+    result = runner(s, images, repeat)
+    result["peak_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(ROOT), capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def _compare(current: Dict[str, Any], baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    before = {r["name"]: r for r in baseline["results"]}
+    print(f"\ncompared with {baseline.get('commit') or baseline_path}")
+    print(f"{'scenario':<52} {'before':>8} {'after':>8} {'change':>8} {'rss':>8}")
+    for r in current["results"]:
+        old = before.get(r["name"])
+        if old is None or "best_s" not in old or "best_s" not in r:
+            continue
+        change = (r["best_s"] - old["best_s"]) / old["best_s"] * 100 if old["best_s"] else 0.0
+        rss = r["peak_rss_mb"] - old["peak_rss_mb"]
+        print(f"{r['name']:<52} {old['best_s']:>8.3f} {r['best_s']:>8.3f} {change:>+7.1f}% {rss:>+7.1f}M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_pptx and the FastAPI endpoints on synthetic decks.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick")
+    parser.add_argument("--only", default="*", help="glob on scenario names, e.g. 'engine/slides=*'")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--no-normalize", action="store_true")
+    parser.add_argument("--output", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to diff against")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(_run_scenario(json.loads(args.scenario), args.repeat)))
+        return
+
+    commit = _git_commit()
+    results = []
+    print(f"{'scenario':<52} {'first':>8} {'best':>8} {'slides/s':>9} {'rss MB':>8}")
+    for scenario in _scenarios(args.preset):
+        scenario.update(workers=args.workers, normalize=not args.no_normalize)
+        name = _name(scenario)
+        if not fnmatch.fnmatch(name, args.only):
+            continue
+        with tempfile.TemporaryDirectory(prefix="bench-cache-") as cache_dir:
+            env = dict(
+                os.environ,
+                PYTHONPATH=str(ROOT),
+                RESULT_CACHE="0",
+                RESULT_CACHE_DIR=os.path.join(cache_dir, "results"),
+                THUMB_CACHE_DIR=os.path.join(cache_dir, "thumbs"),
+            )
+            proc = subprocess.run(
+                [sys.executable, __file__, "--scenario", json.dumps(scenario), "--repeat", str(args.repeat)],
+                cwd=str(ROOT),
+                capture_output=True,
+                text=True,
+                env=env,
+            )
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["failed"])[-1]
+            results.append({"name": name, "params": scenario, "error": error})
+            print(f"{name:<52} error: {error}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        results.append({"name": name, "params": scenario, **result})
+        print(
+            f"{name:<52} {result['first_s']:>8.3f} {result['best_s']:>8.3f} "
+            f"{result['slides_per_s']:>9.1f} {result['peak_rss_mb']:>8.1f}"
+        )
+
+    report = {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "preset": args.preset,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output = Path(args.output) if args.output else ROOT / "benchmarks" / "results" / f"{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nwrote {output}")
+    if args.compare:
+        _compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
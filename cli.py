@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ppt_engine import ENGINE_DIGEST, build_pptx, image_digest, layout_digest, parse_manifest, save_pptx, template_digest
+
+ROOT = Path(__file__).resolve().parent
+STATE_FILE = ".overviewmaker-state.json"
+NO_LOGO = "선택 없음"
+
+
+def _split_list(value: Any) -> List[str]:
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [v.strip() for v in str(value or "").split(",") if v.strip()]
+
+
+def _image_path(name: Any, images_dir: Path) -> Optional[str]:
+    name = str(name or "").strip()
+    if not name:
+        return None
+    path = Path(name)
+    return str(path if path.is_absolute() else images_dir / path)
+
+
+def _row_colors(row: dict) -> List[dict]:
+    if isinstance(row.get("colors"), list):
+        return [
+            {"name": str(c.get("name") or ""), "img": str(c.get("img") or "")}
+            for c in row["colors"]
+            if isinstance(c, dict)
+        ]
+    names = _split_list(row.get("color_names"))
+    images = _split_list(row.get("color_images"))
+    return [{"name": names[i] if i < len(names) else "", "img": img} for i, img in enumerate(images)]
+
+
+def _row_images(row: dict, images_dir: Path) -> List[str]:
+    names = [row.get("main_image")] + [c["img"] for c in _row_colors(row)]
+    return [path for path in (_image_path(n, images_dir) for n in names) if path]
+
+
+def _row_problem(row: Any, images_dir: Path) -> Optional[str]:
+    if not isinstance(row, dict):
+        return "row must be an object"
+    if not str(row.get("code") or "").strip():
+        return "code is required"
+    colors = row.get("colors")
+    if colors not in (None, "") and not (isinstance(colors, list) and all(isinstance(c, dict) for c in colors)):
+        return "colors must be a list of objects"
+    for path in _row_images(row, images_dir):
+        if not os.path.isfile(path):
+            return f"image not found: {path}"
+    return None
+
+
+def _row_product(row: dict, images_dir: Path) -> dict:
+    return {
+        "season_item": str(row.get("season_item") or ""),
+        "season_color": str(row.get("season_color") or "#000000"),
+        "name": str(row.get("name") or ""),
+        "code": str(row.get("code") or ""),
+        "rrp": str(row.get("rrp") or ""),
+        "main_image": _image_path(row.get("main_image"), images_dir),
+        "logo": str(row.get("logo") or NO_LOGO),
+        "artworks": _split_list(row.get("artworks")),
+        "colors": [{"img": _image_path(c["img"], images_dir), "name": c["name"]} for c in _row_colors(row)],
+    }
+
+
+def _deck_name(value: Any) -> str:
+    return re.sub(r"[^\w.-]+", "_", str(value or "").strip()).strip("._") or "ungrouped"
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _asset_digest(path: str) -> Optional[str]:
+    try:
+        return image_digest(path)
+    except Exception:
+        return None
+
+
+def _build_digest(options: Dict[str, Any]) -> str:
+    doc = {
+        "engine": ENGINE_DIGEST,
+        "template": template_digest(options["template_file"]),
+        "layout": layout_digest(options["template_file"]),
+        "artwork_meta": _file_digest(os.path.join(options["artwork_dir"], "_meta.json")),
+        "image_options": options["image_options"],
+        "save_options": options["save_options"],
+    }
+    return hashlib.sha256(json.dumps(doc, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _deck_fingerprint(rows: List[Any], options: Dict[str, Any], build: str) -> str:
+    images_dir = Path(options["images_dir"])
+    images: Dict[str, Any] = {}
+    assets: Dict[str, Any] = {}
+    for row in rows:
+        if not isinstance(row, dict):
+            continue
+        for path in _row_images(row, images_dir):
+            images[path] = _stat_key(path)
+        logo = str(row.get("logo") or NO_LOGO)
+        if logo != NO_LOGO:
+            path = os.path.join(options["logo_dir"], logo)
+            assets[path] = _asset_digest(path)
+        for name in _split_list(row.get("artworks")):
+            path = os.path.join(options["artwork_dir"], name)
+            assets[path] = _asset_digest(path)
+    doc = {
+        "build": build,
+        "rows": rows,
+        "images": images,
+        "assets": assets,
+    }
+    return hashlib.sha256(json.dumps(doc, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def _build_deck(job: Dict[str, Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    options = job["options"]
+    images_dir = Path(options["images_dir"])
+    products = [_row_product(row, images_dir) for row in job["rows"]]
+    target = Path(job["output"])
+    previous = str(target) if job["reuse"] and target.exists() else None
+    stats: Dict[str, Any] = {}
+    kwargs = dict(
+        template_file=options["template_file"],
+        logo_dir=options["logo_dir"],
+        artwork_dir=options["artwork_dir"],
+        stats=stats,
+        skip_failed=True,
+        image_options=options["image_options"],
+        workers=job["workers"],
+        incremental=True,
+    )
+    try:
+        prs = build_pptx(products, previous=previous, **kwargs)
+    except Exception:
+        if previous is None:
+            raise
+        stats.clear()
+        prs = build_pptx(products, **kwargs)
+    result = {
+        "slides": stats["slides"],
+        "reused": stats.get("reused", 0),
+        "errors": [{"row": job["row_numbers"][e["index"]], "code": e["code"], "error": e["error"]} for e in stats["errors"]],
+    }
+    if not stats["slides"]:
+        result["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return result
+
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as out:
+            if options["save_options"] is None:
+                prs.save(out)
+            else:
+                save_pptx(prs, out, **options["save_options"])
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    result["bytes"] = target.stat().st_size
+    result["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _load_state(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_state(path: Path, state: Dict[str, Any]):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(state, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _template_file(value: str) -> str:
+    path = Path(value)
+    if path.suffix.lower() != ".pptx" and not path.exists():
+        path = ROOT / f"{value}.pptx"
+    if not path.exists():
+        raise SystemExit(f"template not found: {value}")
+    return str(path.resolve())
+
+
+def _plan(rows: List[Any], group_by: Optional[str], default_name: str) -> Dict[str, List[int]]:
+    decks: Dict[str, List[int]] = {}
+    for i, row in enumerate(rows):
+        key = row.get(group_by) if group_by and isinstance(row, dict) else default_name
+        decks.setdefault(f"{_deck_name(key)}.pptx", []).append(i)
+    return decks
+
+
+def _report(status: str, name: str, detail: str):
+    print(f"{status:<8} {name:<32} {detail}", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Build .pptx decks from a product manifest without the HTTP API.")
+    parser.add_argument("manifest", help=".csv, .json or .jsonl product manifest (same fields as /api/generate/batch)")
+    parser.add_argument("-o", "--output", default="decks", help="output directory")
+    parser.add_argument("--group-by", help="manifest column to split decks by, e.g. category or season_item")
+    parser.add_argument("--name", help="deck name when not grouping (default: manifest file name)")
+    parser.add_argument("--images", help="directory image paths are relative to (default: manifest directory)")
+    parser.add_argument("--template", default=str(ROOT / "template.pptx"), help="template path or id, e.g. template.backup")
+    parser.add_argument("--logo-dir", default=str(ROOT / "assets" / "logos"))
+    parser.add_argument("--artwork-dir", default=str(ROOT / "assets" / "artworks"))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--force", action="store_true", help="rebuild decks even if their inputs are unchanged")
+    parser.add_argument("--no-normalize", action="store_true", help="embed product images as uploaded")
+    parser.add_argument("--dpi", type=int, help="target DPI for normalized images")
+    parser.add_argument("--jpeg-quality", type=int, help="JPEG quality for normalized images")
+    parser.add_argument("--standard-save", action="store_true", help="save with python-pptx instead of the fast writer")
+    args = parser.parse_args(argv)
+
+    manifest = Path(args.manifest)
+    try:
+        rows = parse_manifest(manifest.read_bytes(), manifest.name)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"cannot read manifest {manifest}: {e}")
+
+    image_options: Optional[Dict[str, Any]] = None
+    if not args.no_normalize:
+        image_options = {}
+        if args.dpi:
+            image_options["dpi"] = args.dpi
+        if args.jpeg_quality:
+            image_options["jpeg_quality"] = args.jpeg_quality
+    options = {
+        "template_file": _template_file(args.template),
+        "logo_dir": os.path.abspath(args.logo_dir),
+        "artwork_dir": os.path.abspath(args.artwork_dir),
+        "images_dir": os.path.abspath(args.images or manifest.parent),
+        "image_options": image_options,
+        "save_options": None if args.standard_save else {},
+    }
+    out_dir = Path(args.output)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for stale in out_dir.glob(".*.pptx.*.tmp"):
+        stale.unlink(missing_ok=True)
+    state_path = out_dir / STATE_FILE
+    state = _load_state(state_path)
+
+    started = time.perf_counter()
+    images_dir = Path(options["images_dir"])
+    build = _build_digest(options)
+    jobs = []
+    counts = {"built": 0, "skipped": 0, "failed": 0}
+    invalid = 0
+    for name, indexes in _plan(rows, args.group_by, args.name or manifest.stem).items():
+        deck_rows = [rows[i] for i in indexes]
+        fingerprint = _deck_fingerprint(deck_rows, options, build)
+        recorded = state.get(name, {})
+        if not args.force and recorded.get("fingerprint") == fingerprint and (out_dir / name).exists():
+            counts["skipped"] += 1
+            _report("skipped", name, f"{recorded.get('slides', 0)} slides, inputs unchanged")
+            continue
+        valid = []
+        for i in indexes:
+            problem = _row_problem(rows[i], images_dir)
+            if problem:
+                invalid += 1
+                code = str(rows[i].get("code", "")) if isinstance(rows[i], dict) else ""
+                print(f"  row {i} {code}: {problem}", file=sys.stderr)
+            else:
+                valid.append(i)
+        jobs.append(
+            {
+                "name": name,
+                "fingerprint": fingerprint,
+                "build": build,
+                "reuse": not args.force and recorded.get("build") == build,
+                "output": str(out_dir / name),
+                "rows": [rows[i] for i in valid],
+                "row_numbers": valid,
+                "options": options,
+                "workers": 1,
+            }
+        )
+
+    def finish(job: Dict[str, Any], result: Optional[Dict[str, Any]], error: Optional[str]):
+        name = job["name"]
+        for e in (result or {}).get("errors", []):
+            print(f"  row {e['row']} {e['code']}: {e['error']}", file=sys.stderr)
+        if error or not result["slides"]:
+            counts["failed"] += 1
+            state.pop(name, None)
+            _report("failed", name, error or "no product could be built")
+        else:
+            counts["built"] += 1
+            slides_per_s = result["slides"] / result["elapsed_s"] if result["elapsed_s"] else 0.0
+            state[name] = {
+                "fingerprint": job["fingerprint"],
+                "build": job["build"],
+                "slides": result["slides"],
+                "bytes": result["bytes"],
+                "elapsed_s": result["elapsed_s"],
+            }
+            _report(
+                "built",
+                name,
+                f"{result['slides']} slides ({result['reused']} reused), {result['elapsed_s']:.2f}s, "
+                f"{slides_per_s:.1f} slides/s, {result['bytes'] / 1e6:.1f} MB",
+            )
+        _save_state(state_path, state)
+        return result["slides"] if result else 0
+
+    slides = 0
+    jobs_n = max(1, args.jobs)
+    if len(jobs) == 1 or jobs_n == 1:
+        for job in jobs:
+            job["workers"] = jobs_n if len(jobs) == 1 else 1
+            try:
+                result, error = _build_deck(job), None
+            except Exception as e:
+                result, error = None, f"{type(e).__name__}: {e}"
+            slides += finish(job, result, error)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=min(jobs_n, len(jobs))) as pool:
+            futures = {pool.submit(_build_deck, job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, f"{type(e).__name__}: {e}"
+                slides += finish(futures[future], result, error)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{sum(counts.values())} decks: {counts['built']} built, {counts['skipped']} skipped, {counts['failed']} failed; "
+        f"{slides} slides in {elapsed:.1f}s ({slides / elapsed if elapsed else 0.0:.1f} slides/s)"
+        + (f"; {invalid} rows skipped" if invalid else "")
+    )
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,40 @@
 from __future__ import annotations
 
+import copy
+import csv
+import hashlib
 import io
 import json
+import multiprocessing
 import os
-from typing import Any, Dict, List
+import queue
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 
+from PIL import Image, ImageDraw, ImageFont, ImageOps
 from pptx import Presentation
 from pptx.dml.color import RGBColor
+from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.text import MSO_ANCHOR, MSO_AUTO_SIZE, PP_ALIGN
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import serialize_part_xml
+from pptx.opc.package import Part
+from pptx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from pptx.opc.serialized import _ContentTypesItem
 from pptx.oxml.ns import qn
 from pptx.oxml.xmlchemy import OxmlElement
+from pptx.parts.image import Image as PptxImage
+from pptx.parts.image import ImagePart
+from pptx.text.text import Font
 from pptx.util import Mm, Pt
 
 # Text specs (mm)
@@ -74,6 +99,103 @@ ARTWORK_MODE_DEFAULT = "default"
 ARTWORK_MODE_HORIZONTAL = "horizontal"
 ARTWORK_MODE_SMALL = "small"
 
+# Placement rules (mm). A template can override any section with a
+# "<template>.layout.json" file next to it.
+LAYOUT_FILE_SUFFIX = ".layout.json"
+DEFAULT_LAYOUT: Dict[str, Any] = {
+    "text": TEXT_SPECS,
+    "rrp": {"anchor": "rrp_label", "left": 250, "top": 15, "width": 50, "height": 15},
+    "main_image": {"center_x": MAIN_IMAGE_CENTER_X_MM, "center_y": MAIN_IMAGE_CENTER_Y_MM, "width": MAIN_IMAGE_WIDTH_MM},
+    "logo": {"center_x": LOGO_CENTER_X_MM, "center_y": LOGO_CENTER_Y_MM, "height": LOGO_HEIGHT_MM},
+    "artworks": {
+        "center_x": ARTWORK_CENTER_X_MM,
+        "top": ARTWORK_START_TOP_MM,
+        "gap": ARTWORK_VERTICAL_GAP_MM,
+        "modes": {
+            ARTWORK_MODE_DEFAULT: {"height": ARTWORK_PORTRAIT_HEIGHT_MM},
+            ARTWORK_MODE_HORIZONTAL: {"width": ARTWORK_DEFAULT_WIDTH_MM},
+            ARTWORK_MODE_SMALL: {"width": ARTWORK_SMALL_WIDTH_MM},
+        },
+    },
+    "colorways": {
+        "image_width": COLORWAY_IMAGE_WIDTH_MM,
+        "grid": {
+            "left": 180,
+            "top": COLORWAY_IMAGE_TOP_MM,
+            "per_row": 3,
+            "col_gap": 5,
+            "image_height": 30,
+            "row_gap": 8,
+            "label_gap": 2,
+            "label_height": 10,
+            "label_font_size": 9,
+        },
+        "rows": {
+            "2": {
+                "left": COLORWAY_TWO_ITEMS_LABEL_START_LEFT_MM,
+                "top": COLORWAY_IMAGE_TOP_MM,
+                "gap": COLORWAY_TWO_ITEMS_LABEL_GAP_MM,
+                "label_top": COLORWAY_TWO_ITEMS_LABEL_TOP_MM,
+                "label_width": 32.0,
+                "label_height": 5.0,
+            },
+            "3": {
+                "left": COLORWAY_THREE_ITEMS_LABEL_START_LEFT_MM,
+                "top": COLORWAY_IMAGE_TOP_MM,
+                "gap": COLORWAY_THREE_ITEMS_LABEL_GAP_MM,
+                "label_top": COLORWAY_THREE_ITEMS_LABEL_TOP_MM,
+                "label_width": 32.0,
+                "label_height": 5.0,
+            },
+        },
+    },
+}
+CIRCLED_NUMBERS = ["①", "②", "③", "④", "⑤", "⑥", "⑦", "⑧", "⑨", "⑩"]
+
+IMAGE_TARGET_DPI = 220
+IMAGE_JPEG_QUALITY = 85
+IMAGE_PNG_COMPRESS_LEVEL = 6
+IMAGE_META_DIR = os.path.join(tempfile.gettempdir(), "overviewmaker-image-meta")
+_LEGACY_IMAGE_META_FILE = ".image_meta.json"
+
+PREVIEW_WIDTH_PX = 1280
+PREVIEW_FONT_DIRS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")]
+
+SAVE_MEDIA_LEVEL = 0
+SAVE_XML_LEVEL = 6
+PRECOMPRESSED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/gif"}
+
+_R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_MANIFEST_NS = "urn:overviewmaker:deck-manifest"
+_MANIFEST_VERSION = 1
+
+with open(__file__, "rb") as _engine_source:
+    ENGINE_DIGEST = hashlib.sha256(_engine_source.read()).hexdigest()
+
+_TEXTBOX_TEMPLATES: Dict[tuple, Any] = {}
+_TEXTBOX_LOCK = threading.Lock()
+_TEXTBOX_TEMPLATES_MAX = 1024
+_SCRATCH: Dict[str, Any] = {}
+
+_TEMPLATE_CACHE: Dict[str, Dict[str, Any]] = {}
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+_LAYOUT_CACHE: Dict[str, Dict[str, Any]] = {}
+_LAYOUT_LOCK = threading.Lock()
+_LAYOUT_TABLES_MAX = 4096
+
+_IMAGE_META: Dict[str, Dict[str, Any]] = {}
+_IMAGE_META_LOCK = threading.Lock()
+_PREVIEW_BACKGROUNDS: "OrderedDict[tuple, Any]" = OrderedDict()
+_PREVIEW_BACKGROUNDS_MAX = 4
+_PREVIEW_FONTS: Dict[tuple, Any] = {}
+_PREVIEW_TILES: "OrderedDict[tuple, Any]" = OrderedDict()
+_PREVIEW_TILES_MAX = 64
+_PREVIEW_LOCK = threading.Lock()
+
+PARALLEL_CHUNK_SIZE = 8
+_PROCESS_POOL: Dict[str, Any] = {"pool": None, "workers": 0}
+_PROCESS_POOL_LOCK = threading.Lock()
+
 
 def _hex_to_rgbcolor(hex_color: str | None):
     if not hex_color:
@@ -121,7 +243,7 @@ def _find_layout_anchor(layout):
     return anchors
 
 
-def _add_text_by_spec(slide, text: str, spec: Dict[str, Any], color_override: str | None = None):
+def _build_text_by_spec(slide, text: str, spec: Dict[str, Any], color_override: str | None = None):
     tb = slide.shapes.add_textbox(
         Mm(spec["left"]),
         Mm(spec["top"]),
@@ -167,7 +289,7 @@ def _add_text_by_spec(slide, text: str, spec: Dict[str, Any], color_override: st
             pass
 
 
-def _add_text_at(slide, text: str, left_mm: float, top_mm: float, width_mm: float, height_mm: float):
+def _build_text_at(slide, text: str, left_mm: float, top_mm: float, width_mm: float, height_mm: float):
     tb = slide.shapes.add_textbox(Mm(left_mm), Mm(top_mm), Mm(width_mm), Mm(height_mm))
     tf = tb.text_frame
     tf.clear()
@@ -204,6 +326,87 @@ def _add_text_at(slide, text: str, left_mm: float, top_mm: float, width_mm: floa
         node.set("typeface", "Averta Light")
 
 
+def _build_text_frame(slide, text: str, left, top, width, height, alignment, font_size=None):
+    tb = slide.shapes.add_textbox(left, top, width, height)
+    tb.text_frame.text = text
+    if font_size is not None:
+        tb.text_frame.paragraphs[0].font.size = font_size
+    tb.text_frame.paragraphs[0].alignment = alignment
+
+
+def _scratch_slide():
+    slide = _SCRATCH.get("slide")
+    if slide is None:
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        _SCRATCH["slide"] = slide
+    return slide
+
+
+def _textbox_template(key: tuple, build: Callable[[Any], None]):
+    template = _TEXTBOX_TEMPLATES.get(key)
+    if template is not None:
+        return template
+    with _TEXTBOX_LOCK:
+        template = _TEXTBOX_TEMPLATES.get(key)
+        if template is None:
+            slide = _scratch_slide()
+            build(slide)
+            template = slide.shapes[-1]._element
+            template.getparent().remove(template)
+            if len(_TEXTBOX_TEMPLATES) >= _TEXTBOX_TEMPLATES_MAX:
+                _TEXTBOX_TEMPLATES.clear()
+            _TEXTBOX_TEMPLATES[key] = template
+    return template
+
+
+def _stamp_textbox(slide, template, text: str, left: int | None = None, top: int | None = None):
+    sp = copy.deepcopy(template)
+    shapes = slide.shapes
+    id_ = shapes._next_shape_id
+    c_nv_pr = sp.nvSpPr.cNvPr
+    c_nv_pr.id = id_
+    c_nv_pr.name = "TextBox %d" % (id_ - 1)
+    if left is not None:
+        sp.x = left
+        sp.y = top
+    r = sp.find(".//" + qn("a:r"))
+    if r is not None:
+        r.text = text
+    shapes._spTree.insert_element_before(sp, "p:extLst")
+    return sp
+
+
+def _add_text_by_spec(slide, text: str, spec: Dict[str, Any], color_override: str | None = None):
+    key = ("spec", tuple(sorted(spec.items())))
+    template = _textbox_template(key, lambda s: _build_text_by_spec(s, "", spec))
+    sp = _stamp_textbox(slide, template, text)
+    rgb = _hex_to_rgbcolor(color_override)
+    if rgb is not None:
+        rpr = sp.find(".//" + qn("a:rPr"))
+        if rpr is not None:
+            Font(rpr).color.rgb = rgb
+
+
+def _add_text_at(slide, text: str, left_mm: float, top_mm: float, width_mm: float, height_mm: float):
+    key = ("at", width_mm, height_mm)
+    template = _textbox_template(key, lambda s: _build_text_at(s, "", 0, 0, width_mm, height_mm))
+    _stamp_textbox(slide, template, text, Mm(left_mm), Mm(top_mm))
+
+
+def _add_text_frame(slide, text: str, left, top, width, height, alignment, font_size=None):
+    if "\n" in text or "\v" in text:
+        _build_text_frame(slide, text, left, top, width, height, alignment, font_size)
+        return
+    key = ("frame", int(width), int(height), alignment, font_size, bool(text))
+    sample = "X" if text else ""
+    template = _textbox_template(
+        key,
+        lambda s: _build_text_frame(s, sample, 0, 0, width, height, alignment, font_size),
+    )
+    _stamp_textbox(slide, template, text, int(left), int(top))
+
+
 def _format_color_name(name: Any) -> str:
     if not name:
         return ""
@@ -233,6 +436,336 @@ def _ensure_slide_number_enabled(prs: Presentation):
     hf.set("sldNum", "1")
 
 
+def _select_layout(prs: Presentation):
+    selected_layout = (
+        _get_layout_by_matching_name(prs, ["default"]) 
+        or _get_layout_by_matching_name(prs, ["title"]) 
+        or _get_layout_by_name(prs, ["HB Title / Content", "CUSTOM"])
+    )
+    if selected_layout is None:
+        selected_layout = prs.slide_layouts[1] if len(prs.slide_layouts) > 1 else prs.slide_layouts[0]
+    return selected_layout
+
+
+def _add_phase(phases: Dict[str, float], name: str, started: float):
+    phases[name] = phases.get(name, 0.0) + time.perf_counter() - started
+
+
+def _template_key(template_file: str):
+    if not os.path.exists(template_file):
+        return None
+    st = os.stat(template_file)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _zip_members(blob: bytes) -> Dict[str, Dict[str, Any]]:
+    members = {}
+    with zipfile.ZipFile(io.BytesIO(blob)) as zf:
+        for info in zf.infolist():
+            name_len, extra_len = struct.unpack("<HH", blob[info.header_offset + 26:info.header_offset + 30])
+            start = info.header_offset + 30 + name_len + extra_len
+            members[info.filename] = {
+                "data": zf.read(info),
+                "raw": blob[start:start + info.compress_size],
+                "crc": info.CRC,
+                "compress_type": info.compress_type,
+            }
+    return members
+
+
+def _prepare_template(template_file: str) -> Dict[str, Any]:
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    if os.path.exists(template_file):
+        with open(template_file, "rb") as f:
+            raw = f.read()
+        prs = Presentation(io.BytesIO(raw))
+    else:
+        raw = b""
+        prs = Presentation()
+    _add_phase(timings, "template_load", started)
+    started = time.perf_counter()
+    _strip_vendor_watermark(prs)
+    _ensure_slide_number_enabled(prs)
+    _add_phase(timings, "watermark_strip", started)
+
+    layout = _select_layout(prs)
+    anchors = {name: (shp.left, shp.top) for name, shp in _find_layout_anchor(layout).items()}
+
+    blob = io.BytesIO()
+    prs.save(blob)
+    return {
+        "blob": blob.getvalue(),
+        "members": _zip_members(blob.getvalue()),
+        "digest": hashlib.sha256(raw).hexdigest(),
+        "layout_index": list(prs.slide_layouts).index(layout),
+        "layout_name": layout.name,
+        "slide_size": (prs.slide_width, prs.slide_height),
+        "anchors": anchors,
+        "timings": timings,
+    }
+
+
+def _get_prepared_template(template_file: str, phases: Dict[str, float] | None = None) -> Dict[str, Any]:
+    path = os.path.abspath(template_file)
+    key = _template_key(path)
+    entry = _TEMPLATE_CACHE.get(path)
+    if entry is not None and entry["key"] == key:
+        return entry
+    with _TEMPLATE_CACHE_LOCK:
+        entry = _TEMPLATE_CACHE.get(path)
+        if entry is None or entry["key"] != key:
+            entry = _prepare_template(path)
+            entry["key"] = key
+            _TEMPLATE_CACHE[path] = entry
+            if phases is not None:
+                for name, elapsed in entry["timings"].items():
+                    phases[name] = phases.get(name, 0.0) + elapsed
+    return entry
+
+
+def _open_template(template_file: str, phases: Dict[str, float] | None = None):
+    entry = _get_prepared_template(template_file, phases)
+    started = time.perf_counter()
+    prs = Presentation(io.BytesIO(entry["blob"]))
+    if phases is not None:
+        _add_phase(phases, "template_load", started)
+    return prs, prs.slide_layouts[entry["layout_index"]], dict(entry["anchors"])
+
+
+def template_digest(template_file: str) -> str:
+    return _get_prepared_template(template_file)["digest"]
+
+
+def layout_file(template_file: str) -> str:
+    return os.path.splitext(os.path.abspath(template_file))[0] + LAYOUT_FILE_SUFFIX
+
+
+def _layout_static(rules: Dict[str, Any]) -> Dict[str, Any]:
+    rrp = rules["rrp"]
+    main = rules["main_image"]
+    logo = rules["logo"]
+    art = rules["artworks"]
+    return {
+        "text": rules["text"],
+        "rrp": {
+            "anchor": rrp.get("anchor"),
+            "left": Mm(rrp["left"]),
+            "top": Mm(rrp["top"]),
+            "width": Mm(rrp["width"]),
+            "height": Mm(rrp["height"]),
+        },
+        "main": (main["width"], Mm(main["center_x"]), Mm(main["center_y"])),
+        "logo": (int(Mm(logo["center_x"])), int(Mm(logo["center_y"])), Mm(logo["height"])),
+        "artworks": (int(Mm(art["center_x"])), int(Mm(art["top"])), int(Mm(art["gap"]))),
+    }
+
+
+_LAYOUT_BOXES = {
+    "rrp": (("left", "top", "width", "height"), ("anchor",)),
+    "main_image": (("center_x", "center_y", "width"), ()),
+    "logo": (("center_x", "center_y", "height"), ()),
+    "artworks": (("center_x", "top", "gap"), ("modes",)),
+    "colorways": (("image_width",), ("grid", "rows")),
+    "colorways.grid": (
+        ("left", "top", "per_row", "col_gap", "image_height", "row_gap", "label_gap", "label_height", "label_font_size"),
+        (),
+    ),
+    "colorways.rows": (("left", "top", "gap", "label_top", "label_width", "label_height"), ()),
+    "text": (("left", "top", "width", "height", "font_size"), ("font_name", "bold", "color_hex")),
+}
+
+
+def _check_layout_box(where: str, box: Any, kind: str):
+    numbers, optional = _LAYOUT_BOXES[kind]
+    if not isinstance(box, dict):
+        raise ValueError(f"{where} must be an object")
+    unknown = sorted(set(box) - set(numbers) - set(optional))
+    if unknown:
+        raise ValueError(f"{where} has unknown keys: {', '.join(unknown)}")
+    for key in numbers:
+        value = box.get(key)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{where}.{key} must be a number")
+
+
+def _validate_layout(rules: Dict[str, Any]):
+    unknown = sorted(set(rules) - set(DEFAULT_LAYOUT))
+    if unknown:
+        raise ValueError(f"unknown sections: {', '.join(unknown)}")
+    for name in ("text", "rrp", "main_image", "logo", "artworks", "colorways"):
+        if name not in rules:
+            raise ValueError(f"{name} is required")
+    if not isinstance(rules["text"], dict):
+        raise ValueError("text must be an object")
+    for name in ("season", "category", "code"):
+        spec = rules["text"].get(name)
+        _check_layout_box(f"text.{name}", spec, "text")
+        if not isinstance(spec.get("font_name"), str):
+            raise ValueError(f"text.{name}.font_name must be a string")
+    for name in ("rrp", "main_image", "logo", "artworks", "colorways"):
+        _check_layout_box(name, rules[name], name)
+    modes = rules["artworks"].get("modes")
+    if not isinstance(modes, dict) or not isinstance(modes.get(ARTWORK_MODE_DEFAULT), dict):
+        raise ValueError(f"artworks.modes.{ARTWORK_MODE_DEFAULT} is required")
+    for mode, size in modes.items():
+        if not isinstance(size, dict) or not set(size) or set(size) - {"width", "height"}:
+            raise ValueError(f"artworks.modes.{mode} must set width or height")
+        for key, value in size.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"artworks.modes.{mode}.{key} must be a number")
+    colorways = rules["colorways"]
+    _check_layout_box("colorways.grid", colorways.get("grid"), "colorways.grid")
+    if not isinstance(colorways["grid"]["per_row"], int) or colorways["grid"]["per_row"] < 1:
+        raise ValueError("colorways.grid.per_row must be a positive integer")
+    rows = colorways.get("rows", {})
+    if not isinstance(rows, dict):
+        raise ValueError("colorways.rows must be an object")
+    for count, row in rows.items():
+        if not str(count).isdigit() or int(count) < 1:
+            raise ValueError(f"colorways.rows key {count!r} must be a color count")
+        _check_layout_box(f"colorways.rows.{count}", row, "colorways.rows")
+
+
+def _merge_layout(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = dict(base)
+    for key, value in override.items():
+        if value is None:
+            merged.pop(key, None)
+        elif isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_layout(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _load_layout(path: str) -> Dict[str, Any]:
+    rules = DEFAULT_LAYOUT
+    raw = b""
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            override = json.loads(raw.decode("utf-8-sig"))
+            if not isinstance(override, dict):
+                raise ValueError("expected an object")
+            rules = _merge_layout(DEFAULT_LAYOUT, override)
+            _validate_layout(rules)
+            static = _layout_static(rules)
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"invalid layout file {path}: {e}") from e
+    else:
+        static = _layout_static(rules)
+    return {
+        "rules": rules,
+        "static": static,
+        "digest": hashlib.sha256(raw).hexdigest() if raw else "default",
+        "tables": {},
+    }
+
+
+def _get_layout(template_file: str) -> Dict[str, Any]:
+    path = layout_file(template_file)
+    key = _template_key(path)
+    entry = _LAYOUT_CACHE.get(path)
+    if entry is not None and entry["key"] == key:
+        return entry
+    with _LAYOUT_LOCK:
+        entry = _LAYOUT_CACHE.get(path)
+        if entry is None or entry["key"] != key:
+            entry = _load_layout(path)
+            entry["key"] = key
+            _LAYOUT_CACHE[path] = entry
+    return entry
+
+
+def layout_digest(template_file: str) -> str:
+    return _get_layout(template_file)["digest"]
+
+
+def _colorway_boxes(rules: Dict[str, Any], count: int) -> List[tuple]:
+    width = rules["image_width"]
+    row = rules["rows"].get(str(count))
+    boxes = []
+    if row is not None:
+        for i in range(count):
+            left = row["left"] + (i * row["gap"])
+            number = CIRCLED_NUMBERS[i] if i < len(CIRCLED_NUMBERS) else f"({i + 1})"
+            label = ("at", number, left, row["label_top"], row["label_width"], row["label_height"])
+            boxes.append((Mm(left), Mm(row["top"]), width, label))
+        return boxes
+
+    grid = rules["grid"]
+    per_row = grid["per_row"]
+    rows = max(1, (count + per_row - 1) // per_row)
+    pitch = grid["image_height"] + grid["row_gap"] + grid["label_height"]
+    for i in range(count):
+        cy = grid["top"] - (rows - 1 - i // per_row) * pitch
+        cx = grid["left"] + ((i % per_row) * (width + grid["col_gap"]))
+        label = (
+            "frame",
+            None,
+            Mm(cx),
+            Mm(cy + grid["image_height"] + grid["label_gap"]),
+            Mm(width),
+            Mm(grid["label_height"]),
+            PP_ALIGN.CENTER,
+            Pt(grid["label_font_size"]),
+        )
+        boxes.append((Mm(cx), Mm(cy), width, label))
+    return boxes
+
+
+def _geometry_table(layout: Dict[str, Any], color_count: int, modes: tuple) -> Dict[str, Any]:
+    key = (color_count, modes)
+    table = layout["tables"].get(key)
+    if table is not None:
+        return table
+    rules = layout["rules"]
+    sizes = rules["artworks"]["modes"]
+    artworks = []
+    for mode in modes:
+        size = sizes.get(mode) or sizes[ARTWORK_MODE_DEFAULT]
+        artworks.append(
+            (
+                Mm(size["width"]) if size.get("width") else None,
+                Mm(size["height"]) if size.get("height") else None,
+            )
+        )
+    table = {"artworks": artworks, "colors": _colorway_boxes(rules["colorways"], color_count)}
+    with _LAYOUT_LOCK:
+        if len(layout["tables"]) >= _LAYOUT_TABLES_MAX:
+            layout["tables"].clear()
+        layout["tables"][key] = table
+    return table
+
+
+def preload_template(template_file: str) -> Dict[str, Any]:
+    if not os.path.exists(template_file):
+        raise FileNotFoundError(template_file)
+    entry = _get_prepared_template(template_file)
+    return {
+        "digest": entry["digest"],
+        "layout": _get_layout(template_file)["digest"],
+        "slide_layout": entry["layout_name"],
+        "anchors": sorted(entry["anchors"]),
+        "slide_size_mm": [round(size / 36000, 2) for size in entry["slide_size"]],
+    }
+
+
+def clear_template_cache(template_file: str | None = None):
+    with _TEMPLATE_CACHE_LOCK:
+        if template_file is None:
+            _TEMPLATE_CACHE.clear()
+        else:
+            _TEMPLATE_CACHE.pop(os.path.abspath(template_file), None)
+    with _LAYOUT_LOCK:
+        if template_file is None:
+            _LAYOUT_CACHE.clear()
+        else:
+            _LAYOUT_CACHE.pop(layout_file(template_file), None)
+
+
 def _load_artwork_meta(meta_path: str) -> Dict[str, str]:
     if not os.path.exists(meta_path):
         return {}
@@ -251,119 +784,1179 @@ def _get_artwork_mode(art_name: str, meta: Dict[str, str]) -> str:
     return mode
 
 
-def generate_pptx(
-    products: List[Dict[str, Any]],
+def _read_image_bytes(image_file) -> bytes:
+    if isinstance(image_file, (str, os.PathLike)):
+        with open(image_file, "rb") as f:
+            return f.read()
+    image_file.seek(0)
+    return image_file.read()
+
+
+def _image_size_bytes(image_file) -> int:
+    if isinstance(image_file, (str, os.PathLike)):
+        return os.path.getsize(image_file)
+    image_file.seek(0, os.SEEK_END)
+    size = image_file.tell()
+    image_file.seek(0)
+    return size
+
+
+def _normalize_image(image_file, width_mm: float, options: Dict[str, Any], stats: Dict[str, Any]):
+    raw_size = _image_size_bytes(image_file)
+    dpi = options.get("dpi", IMAGE_TARGET_DPI)
+    target_px = max(1, int(round(width_mm / 25.4 * dpi)))
+    try:
+        with Image.open(image_file) as src:
+            src_format = src.format
+            if src_format == "JPEG":
+                shown_w = src.width if src.getexif().get(0x0112, 1) < 5 else src.height
+                if shown_w > target_px:
+                    scale = target_px / shown_w
+                    src.draft(src.mode, (int(src.width * scale) + 1, int(src.height * scale) + 1))
+            img = ImageOps.exif_transpose(src)
+            if img.width > target_px:
+                target_h = max(1, int(round(img.height * target_px / img.width)))
+                img = img.resize((target_px, target_h), Image.LANCZOS)
+            has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+            out = io.BytesIO()
+            if src_format == "PNG" or has_alpha:
+                if img.mode not in ("RGB", "RGBA", "L", "LA", "P"):
+                    img = img.convert("RGBA" if has_alpha else "RGB")
+                img.save(
+                    out,
+                    "PNG",
+                    optimize=True,
+                    compress_level=options.get("png_compress_level", IMAGE_PNG_COMPRESS_LEVEL),
+                    dpi=(dpi, dpi),
+                    icc_profile=None,
+                    exif=None,
+                )
+            else:
+                if img.mode not in ("RGB", "L"):
+                    img = img.convert("RGB")
+                img.save(
+                    out,
+                    "JPEG",
+                    quality=options.get("jpeg_quality", IMAGE_JPEG_QUALITY),
+                    optimize=True,
+                    dpi=(dpi, dpi),
+                )
+    except Exception:
+        return image_file
+
+    stats["images_normalized"] = stats.get("images_normalized", 0) + 1
+    stats["image_bytes_in"] = stats.get("image_bytes_in", 0) + raw_size
+    if out.tell() >= raw_size:
+        stats["image_bytes_out"] = stats.get("image_bytes_out", 0) + raw_size
+        return image_file
+    stats["image_bytes_out"] = stats.get("image_bytes_out", 0) + out.tell()
+    out.seek(0)
+    return out
+
+
+def _prepare_picture(ctx: Dict[str, Any], image_file, width_mm: float):
+    if ctx["image_options"] is None:
+        return image_file
+    started = time.perf_counter()
+    image_file = _normalize_image(image_file, width_mm, ctx["image_options"], ctx["image_stats"])
+    _add_phase(ctx["phases"], "image_normalize", started)
+    return image_file
+
+
+def _new_media_registry(prs: Presentation) -> Dict[str, Any]:
+    parts: Dict[str, Any] = {}
+    used_idxs = set()
+    for part in prs.part.package.iter_parts():
+        if part.partname.startswith("/ppt/media/image") and part.partname.idx is not None:
+            used_idxs.add(part.partname.idx)
+        if isinstance(part, ImagePart):
+            parts.setdefault(part.sha1, part)
+    return {"parts": parts, "used_idxs": used_idxs, "refs": 0, "used": set()}
+
+
+def _registry_image_part(ctx: Dict[str, Any], image: PptxImage):
+    registry = ctx["media"]
+    sha1 = image.sha1
+    part = registry["parts"].get(sha1)
+    if part is None:
+        idx = 1
+        while idx in registry["used_idxs"]:
+            idx += 1
+        registry["used_idxs"].add(idx)
+        partname = PackURI("/ppt/media/image%d.%s" % (idx, image.ext))
+        part = ImagePart(partname, image.content_type, ctx["prs"].part.package, image.blob, image.filename)
+        registry["parts"][sha1] = part
+    registry["refs"] += 1
+    registry["used"].add(sha1)
+    return part
+
+
+def _add_picture(ctx: Dict[str, Any], slide, image_file, left, top, width=None, height=None):
+    started = time.perf_counter()
+    image_part = _registry_image_part(ctx, PptxImage.from_file(image_file))
+    rId = slide.part.relate_to(image_part, RT.IMAGE)
+    pic = slide.shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+    slide.shapes._recalculate_extents()
+    _add_phase(ctx["phases"], "image_embed", started)
+    return slide.shapes._shape_factory(pic)
+
+
+def image_meta_file(directory: str) -> str:
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:20]
+    return os.path.join(IMAGE_META_DIR, f"{key}.json")
+
+
+def set_image_meta_dir(path: str):
+    global IMAGE_META_DIR
+    with _IMAGE_META_LOCK:
+        IMAGE_META_DIR = str(path)
+        _IMAGE_META.clear()
+
+
+def _image_meta_store(directory: str) -> Dict[str, Any]:
+    directory = os.path.abspath(directory)
+    with _IMAGE_META_LOCK:
+        store = _IMAGE_META.get(directory)
+        if store is None:
+            entries: Dict[str, Any] = {}
+            try:
+                with open(image_meta_file(directory), "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                entries = loaded if isinstance(loaded, dict) else {}
+            except (OSError, ValueError):
+                pass
+            try:
+                os.remove(os.path.join(directory, _LEGACY_IMAGE_META_FILE))
+            except OSError:
+                pass
+            store = {"entries": entries, "dirty": False}
+            _IMAGE_META[directory] = store
+        return store
+
+
+def _image_meta(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    store = _image_meta_store(os.path.dirname(path))
+    name = os.path.basename(path)
+    with _IMAGE_META_LOCK:
+        meta = store["entries"].get(name)
+    if isinstance(meta, dict) and meta.get("mtime_ns") == st.st_mtime_ns and meta.get("size") == st.st_size:
+        return meta, None
+    image = PptxImage.from_file(path)
+    meta = {
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "px": list(image.size),
+        "dpi": list(image.dpi),
+        "format": image.ext,
+        "content_type": image.content_type,
+        "sha1": image.sha1,
+    }
+    with _IMAGE_META_LOCK:
+        store["entries"][name] = meta
+        store["dirty"] = True
+    return meta, image
+
+
+def _probe_asset(ctx: Dict[str, Any], path: str):
+    started = time.perf_counter()
+    asset = _image_meta(path)
+    if asset is not None:
+        ctx["image_meta"]["hits" if asset[1] is None else "misses"] += 1
+        _add_phase(ctx["phases"], "image_embed", started)
+    return asset
+
+
+def image_digest(path: str) -> str | None:
+    asset = _image_meta(path)
+    return asset[0]["sha1"] if asset is not None else None
+
+
+def _asset_extent(meta: Dict[str, Any], width=None, height=None):
+    native_cx = int(914400 * meta["px"][0] / meta["dpi"][0])
+    native_cy = int(914400 * meta["px"][1] / meta["dpi"][1])
+    if width and not height:
+        return width, int(round(native_cy * (float(width) / float(native_cx))))
+    if height and not width:
+        return int(round(native_cx * (float(height) / float(native_cy)))), height
+    return width or native_cx, height or native_cy
+
+
+def _add_asset_picture(ctx: Dict[str, Any], slide, path: str, asset, left, top, width, height):
+    started = time.perf_counter()
+    meta, image = asset
+    registry = ctx["media"]
+    image_part = registry["parts"].get(meta["sha1"])
+    if image_part is None:
+        image_part = _registry_image_part(ctx, image or PptxImage.from_file(path))
+    else:
+        registry["refs"] += 1
+        registry["used"].add(meta["sha1"])
+    rId = slide.part.relate_to(image_part, RT.IMAGE)
+    shapes = slide.shapes
+    id_ = shapes._next_shape_id
+    shapes._grpSp.add_pic(id_, "Picture %d" % (id_ - 1), os.path.basename(path), rId, left, top, width, height)
+    shapes._recalculate_extents()
+    _add_phase(ctx["phases"], "image_embed", started)
+
+
+def _flush_image_meta():
+    with _IMAGE_META_LOCK:
+        pending = [(d, dict(store["entries"])) for d, store in _IMAGE_META.items() if store["dirty"]]
+    for directory, entries in pending:
+        entries = {name: meta for name, meta in entries.items() if os.path.exists(os.path.join(directory, name))}
+        target = image_meta_file(directory)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f, ensure_ascii=False, sort_keys=True)
+            os.replace(tmp, target)
+        except OSError:
+            continue
+        with _IMAGE_META_LOCK:
+            if directory in _IMAGE_META:
+                _IMAGE_META[directory]["dirty"] = False
+
+
+def clear_image_meta_cache():
+    with _IMAGE_META_LOCK:
+        _IMAGE_META.clear()
+
+
+def _drop_last_slide(prs: Presentation):
+    sld_id_lst = prs.slides._sldIdLst
+    sld_ids = list(sld_id_lst)
+    if not sld_ids:
+        return
+    last = sld_ids[-1]
+    prs.part.drop_rel(last.rId)
+    sld_id_lst.remove(last)
+
+
+def _slide_geometry(ctx: Dict[str, Any], data: Dict[str, Any]) -> List[tuple]:
+    layout = ctx["geometry"]
+    static = layout["static"]
+    text_specs = static["text"]
+    ops: List[tuple] = []
+
+    season_name = data.get("season_item", "")
+    if season_name:
+        ops.append(("spec", season_name, text_specs["season"], data.get("season_color")))
+    ops.append(("spec", data.get("name", ""), text_specs["category"], None))
+    ops.append(("spec", data.get("code", ""), text_specs["code"], None))
+
+    if data.get("rrp"):
+        rrp = static["rrp"]
+        rrp_left, rrp_top = ctx["anchors"].get(rrp["anchor"]) or (rrp["left"], rrp["top"])
+        ops.append(("frame", f"RRP : {data['rrp']}", rrp_left, rrp_top, rrp["width"], rrp["height"], PP_ALIGN.RIGHT, None))
+
+    if data.get("main_image"):
+        ops.append(("main", data["main_image"], *static["main"]))
+
+    if data.get("logo") and data["logo"] != "선택 없음":
+        p_logo = os.path.join(ctx["logo_dir"], data["logo"])
+        logo = _probe_asset(ctx, p_logo)
+        if logo is not None:
+            center_x, center_y, height = static["logo"]
+            cx, cy = _asset_extent(logo[0], height=height)
+            ops.append(("asset", p_logo, logo, int(center_x - (cx / 2)), int(center_y - (cy / 2)), cx, cy))
+
+    artworks = []
+    for art_name in data.get("artworks", []):
+        p_art = os.path.join(ctx["artwork_dir"], art_name)
+        art = _probe_asset(ctx, p_art)
+        if art is not None:
+            artworks.append((p_art, art, _get_artwork_mode(art_name, ctx["artwork_meta"])))
+
+    colors = data.get("colors", [])
+    table = _geometry_table(layout, len(colors), tuple(mode for _, _, mode in artworks))
+
+    center_x, current_top, gap = static["artworks"]
+    for (p_art, art, _), (width, height) in zip(artworks, table["artworks"]):
+        cx, cy = _asset_extent(art[0], width=width, height=height)
+        ops.append(("asset", p_art, art, int(center_x - (cx / 2)), current_top, cx, cy))
+        current_top += cy + gap
+
+    for c, (left, top, width_mm, label) in zip(colors, table["colors"]):
+        if c.get("img"):
+            ops.append(("picture", c["img"], left, top, width_mm))
+        name = _format_color_name(c.get("name"))
+        if label[0] == "at":
+            ops.append(("at", label[1] + name, *label[2:]))
+        else:
+            ops.append(("frame", name, *label[2:]))
+    return ops
+
+
+def _add_product_slide(ctx: Dict[str, Any], data: Dict[str, Any]):
+    ops = _slide_geometry(ctx, data)
+    slide = ctx["prs"].slides.add_slide(ctx["layout"])
+    for op in ops:
+        kind = op[0]
+        if kind == "spec":
+            _add_text_by_spec(slide, op[1], op[2], color_override=op[3])
+        elif kind == "frame":
+            _add_text_frame(slide, *op[1:])
+        elif kind == "at":
+            _add_text_at(slide, *op[1:])
+        elif kind == "main":
+            _, image_file, width_mm, center_x, center_y = op
+            main_image = _prepare_picture(ctx, image_file, width_mm)
+            main_pic = _add_picture(ctx, slide, main_image, left=Mm(0), top=Mm(0), width=Mm(width_mm))
+            main_pic.left = int(center_x - (main_pic.width / 2))
+            main_pic.top = int(center_y - (main_pic.height / 2))
+        elif kind == "asset":
+            _add_asset_picture(ctx, slide, *op[1:])
+        elif kind == "picture":
+            _, image_file, left, top, width_mm = op
+            color_image = _prepare_picture(ctx, image_file, width_mm)
+            _add_picture(ctx, slide, color_image, left=left, top=top, width=Mm(width_mm))
+    return slide
+
+
+def _theme_colors(master) -> Dict[str, str]:
+    colors: Dict[str, str] = {}
+    try:
+        theme = master.part.part_related_by(RT.THEME)
+    except KeyError:
+        return colors
+    scheme = ElementTree.fromstring(theme.blob).find(".//" + qn("a:clrScheme"))
+    if scheme is None:
+        return colors
+    for node in scheme:
+        name = node.tag.split("}")[-1]
+        srgb = node.find(qn("a:srgbClr"))
+        system = node.find(qn("a:sysClr"))
+        if srgb is not None:
+            colors[name] = srgb.get("val")
+        elif system is not None:
+            colors[name] = system.get("lastClr")
+    for alias, name in (("bg1", "lt1"), ("tx1", "dk1"), ("bg2", "lt2"), ("tx2", "dk2")):
+        if name in colors:
+            colors[alias] = colors[name]
+    return colors
+
+
+def _fill_color(node, theme: Dict[str, str]):
+    fill = node.find(qn("a:solidFill")) if node is not None else None
+    if fill is None:
+        return None
+    for child in fill:
+        if child.tag == qn("a:srgbClr"):
+            return "#" + child.get("val")
+        if child.tag == qn("a:schemeClr") and theme.get(child.get("val")):
+            return "#" + theme[child.get("val")]
+    return None
+
+
+def _preview_font(name: str | None, px: int, bold: bool = False):
+    key = (name, px, bold)
+    font = _PREVIEW_FONTS.get(key)
+    if font is not None:
+        return font
+    candidates = []
+    if name:
+        for base in (name, name.replace(" ", ""), name.replace(" ", "-")):
+            candidates += [base + ".ttf", base + ".otf"]
+    candidates.append("DejaVuSans-Bold.ttf" if bold else "DejaVuSans.ttf")
+    for candidate in candidates:
+        for path in [os.path.join(d, candidate) for d in PREVIEW_FONT_DIRS] + [candidate]:
+            try:
+                font = ImageFont.truetype(path, px)
+                break
+            except OSError:
+                continue
+        if font is not None:
+            break
+    if font is None:
+        font = ImageFont.load_default(size=px)
+    _PREVIEW_FONTS[key] = font
+    return font
+
+
+def _preview_box(left, top, width, height, scale: float):
+    x0, y0 = int(round(left * scale)), int(round(top * scale))
+    return x0, y0, x0 + max(1, int(round(width * scale))), y0 + max(1, int(round(height * scale)))
+
+
+def _draw_text(canvas, text: str, box, font_px: float, color, align: str = "l", font_name=None, bold=False, inset=(0, 0)):
+    if not text:
+        return
+    font = _preview_font(font_name, max(1, int(round(font_px))), bool(bold))
+    draw = ImageDraw.Draw(canvas)
+    left, top, right = box[0] + inset[0], box[1] + inset[1], box[2] - inset[0]
+    for i, line in enumerate(text.replace("\v", "\n").split("\n")):
+        length = draw.textlength(line, font=font)
+        if align == "r":
+            x = right - length
+        elif align == "ctr":
+            x = (left + right - length) / 2
+        else:
+            x = left
+        draw.text((x, top + i * font_px * 1.2), line, font=font, fill=color)
+
+
+def _image_aspect(image_file) -> float:
+    if not isinstance(image_file, (str, os.PathLike)):
+        image_file.seek(0)
+    with Image.open(image_file) as src:
+        transposed = src.getexif().get(0x0112, 1) >= 5
+        w, h = (src.height, src.width) if transposed else src.size
+    if not isinstance(image_file, (str, os.PathLike)):
+        image_file.seek(0)
+    return h / w
+
+
+def _preview_tile(image_file, size):
+    if isinstance(image_file, (str, os.PathLike)):
+        asset = _image_meta(str(image_file))
+        digest = asset[0]["sha1"] if asset is not None else None
+    else:
+        digest = _stream_digest(image_file)
+    key = (digest, size)
+    with _PREVIEW_LOCK:
+        tile = _PREVIEW_TILES.get(key)
+        if tile is not None:
+            _PREVIEW_TILES.move_to_end(key)
+            return tile
+    if not isinstance(image_file, (str, os.PathLike)):
+        image_file.seek(0)
+    with Image.open(image_file) as src:
+        if src.format == "JPEG":
+            src.draft("RGB", size)
+        img = ImageOps.exif_transpose(src).convert("RGBA")
+    if not isinstance(image_file, (str, os.PathLike)):
+        image_file.seek(0)
+    tile = img.resize(size, Image.BILINEAR)
+    with _PREVIEW_LOCK:
+        _PREVIEW_TILES[key] = tile
+        while len(_PREVIEW_TILES) > _PREVIEW_TILES_MAX:
+            _PREVIEW_TILES.popitem(last=False)
+    return tile
+
+
+def _paste_image(canvas, image_file, box):
+    tile = _preview_tile(image_file, (max(1, box[2] - box[0]), max(1, box[3] - box[1])))
+    canvas.paste(tile, box[:2], tile)
+
+
+def _draw_layout_shape(canvas, shape, scale: float, theme: Dict[str, str]):
+    box = _preview_box(shape.left or 0, shape.top or 0, shape.width or 0, shape.height or 0, scale)
+    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+        with Image.open(io.BytesIO(shape.image.blob)) as src:
+            img = src.convert("RGBA").resize((box[2] - box[0], box[3] - box[1]), Image.LANCZOS)
+        canvas.paste(img, box[:2], img)
+        return
+    sp_pr = shape._element.find(qn("p:spPr"))
+    line = sp_pr.find(qn("a:ln")) if sp_pr is not None else None
+    fill = _fill_color(sp_pr, theme)
+    outline = _fill_color(line, theme)
+    if fill or outline:
+        line_px = max(1, int(round(int(line.get("w", "12700")) * scale))) if outline else 0
+        ImageDraw.Draw(canvas).rectangle((box[0], box[1], box[2] - 1, box[3] - 1), fill=fill, outline=outline, width=line_px)
+    if not getattr(shape, "has_text_frame", False) or not shape.text.strip():
+        return
+    paragraph = shape.text_frame.paragraphs[0]
+    r_pr = shape._element.find(".//" + qn("a:rPr"))
+    size = int(r_pr.get("sz")) * 127 if r_pr is not None and r_pr.get("sz") else int(Pt(18))
+    color = _fill_color(r_pr, theme) or "#000000"
+    p_pr = paragraph._p.pPr
+    align = p_pr.get("algn", "l") if p_pr is not None else "l"
+    inset = (int(round(91440 * scale)), int(round(45720 * scale)))
+    _draw_text(canvas, shape.text, box, size * scale, color, align, bold=r_pr is not None and r_pr.get("b") == "1", inset=inset)
+
+
+def _preview_background(template_file: str, width: int):
+    entry = _get_prepared_template(template_file)
+    key = (entry["digest"], width)
+    with _PREVIEW_LOCK:
+        cached = _PREVIEW_BACKGROUNDS.get(key)
+        if cached is not None:
+            _PREVIEW_BACKGROUNDS.move_to_end(key)
+    if cached is None:
+        prs, layout, _ = _open_template(template_file)
+        scale = width / prs.slide_width
+        master = layout.slide_master
+        theme = _theme_colors(master)
+        background = "#FFFFFF"
+        for container in (layout, master):
+            bg = container._element.cSld.bg
+            if bg is not None:
+                background = _fill_color(bg.find(qn("p:bgPr")), theme) or background
+                break
+        canvas = Image.new("RGB", (width, int(round(prs.slide_height * scale))), background)
+        containers = [layout] if layout._element.get("showMasterSp") == "0" else [master, layout]
+        for container in containers:
+            for shape in container.shapes:
+                if not shape.is_placeholder:
+                    _draw_layout_shape(canvas, shape, scale, theme)
+        cached = (canvas, scale)
+        with _PREVIEW_LOCK:
+            _PREVIEW_BACKGROUNDS[key] = cached
+            while len(_PREVIEW_BACKGROUNDS) > _PREVIEW_BACKGROUNDS_MAX:
+                _PREVIEW_BACKGROUNDS.popitem(last=False)
+    return cached[0].copy(), cached[1]
+
+
+def render_preview(
+    product: Dict[str, Any],
     template_file: str = "template.pptx",
     logo_dir: str = "assets/logos",
     artwork_dir: str = "assets/artworks",
+    width: int = PREVIEW_WIDTH_PX,
+    stats: Dict[str, Any] | None = None,
+) -> Image.Image:
+    started = time.perf_counter()
+    canvas, scale = _preview_background(template_file, width)
+    ctx = {
+        "anchors": dict(_get_prepared_template(template_file)["anchors"]),
+        "geometry": _get_layout(template_file),
+        "logo_dir": logo_dir,
+        "artwork_dir": artwork_dir,
+        "artwork_meta": _load_artwork_meta(os.path.join(artwork_dir, "_meta.json")),
+        "image_meta": {"hits": 0, "misses": 0},
+        "phases": {},
+    }
+    for op in _slide_geometry(ctx, product):
+        kind = op[0]
+        if kind == "spec":
+            spec = op[2]
+            rgb = _hex_to_rgbcolor(op[3]) or _hex_to_rgbcolor(spec.get("color_hex")) or (0, 0, 0)
+            box = _preview_box(Mm(spec["left"]), Mm(spec["top"]), Mm(spec["width"]), Mm(spec["height"]), scale)
+            _draw_text(canvas, op[1], box, Pt(spec["font_size"]) * scale, tuple(rgb), "l", spec["font_name"], spec.get("bold"))
+        elif kind == "frame":
+            _, text, left, top, w, h, alignment, font_size = op
+            align = {PP_ALIGN.RIGHT: "r", PP_ALIGN.CENTER: "ctr"}.get(alignment, "l")
+            inset = (int(round(91440 * scale)), int(round(45720 * scale)))
+            box = _preview_box(left, top, w, h, scale)
+            _draw_text(canvas, text, box, (font_size or Pt(18)) * scale, (0, 0, 0), align, inset=inset)
+        elif kind == "at":
+            _, text, left, top, w, h = op
+            box = _preview_box(Mm(left), Mm(top), Mm(w), Mm(h), scale)
+            _draw_text(canvas, text, box, Pt(10) * scale, (0, 0, 0), "l", "Averta Light")
+        elif kind == "main":
+            _, image_file, width_mm, center_x, center_y = op
+            cx = int(Mm(width_mm))
+            cy = int(round(cx * _image_aspect(image_file)))
+            left = int(center_x - (cx / 2))
+            top = int(center_y - (cy / 2))
+            _paste_image(canvas, image_file, _preview_box(left, top, cx, cy, scale))
+        elif kind == "asset":
+            _, path, _, left, top, cx, cy = op
+            _paste_image(canvas, path, _preview_box(left, top, cx, cy, scale))
+        elif kind == "picture":
+            _, image_file, left, top, width_mm = op
+            cx = Mm(width_mm)
+            cy = int(round(cx * _image_aspect(image_file)))
+            _paste_image(canvas, image_file, _preview_box(left, top, cx, cy, scale))
+    _flush_image_meta()
+    if stats is not None:
+        stats["elapsed_s"] = round(time.perf_counter() - started, 4)
+        stats["image_meta_hits"] = ctx["image_meta"]["hits"]
+        stats["image_meta_misses"] = ctx["image_meta"]["misses"]
+    return canvas
+
+
+def _new_context(
+    template_file: str,
+    logo_dir: str,
+    artwork_dir: str,
+    image_options: Dict[str, Any] | None,
+) -> Dict[str, Any]:
+    phases: Dict[str, float] = {}
+    prs, selected_layout, layout_anchors = _open_template(template_file, phases)
+    return {
+        "prs": prs,
+        "layout": selected_layout,
+        "anchors": layout_anchors,
+        "geometry": _get_layout(template_file),
+        "logo_dir": logo_dir,
+        "artwork_dir": artwork_dir,
+        "artwork_meta": _load_artwork_meta(os.path.join(artwork_dir, "_meta.json")),
+        "image_options": image_options,
+        "image_stats": {},
+        "media": _new_media_registry(prs),
+        "image_meta": {"hits": 0, "misses": 0},
+        "phases": phases,
+        "errors": [],
+        "built": 0,
+        "reused": 0,
+    }
+
+
+def _report_progress(ctx: Dict[str, Any], done: int):
+    if ctx.get("progress") is not None:
+        ctx["progress"](done, ctx.get("total"))
+
+
+def _build_slides(
+    ctx: Dict[str, Any],
+    products: Iterable[Dict[str, Any]],
+    skip_failed: bool,
+    offset: int = 0,
+    reuse: Callable[[int], bool] | None = None,
 ):
-    prs = Presentation(template_file) if os.path.exists(template_file) else Presentation()
-    _strip_vendor_watermark(prs)
-    _ensure_slide_number_enabled(prs)
+    prs = ctx["prs"]
+    phases = ctx["phases"]
+    nested = ("image_normalize", "image_embed", "slide_reuse", "fingerprint")
+    started = time.perf_counter()
+    nested_time = sum(phases.get(name, 0.0) for name in nested)
+    for index, data in enumerate(products, start=offset):
+        _report_progress(ctx, index)
+        if reuse is not None and reuse(index):
+            ctx["built"] += 1
+            continue
+        slide_count = len(prs.slides)
+        try:
+            _add_product_slide(ctx, data)
+        except Exception as e:
+            if not skip_failed:
+                raise
+            if len(prs.slides) > slide_count:
+                _drop_last_slide(prs)
+            ctx["errors"].append({"index": index, "code": str(data.get("code", "")), "error": f"{type(e).__name__}: {e}"})
+            continue
+        ctx["built"] += 1
+    nested_time = sum(phases.get(name, 0.0) for name in nested) - nested_time
+    _add_phase(phases, "slide_build", started + nested_time)
 
-    selected_layout = (
-        _get_layout_by_matching_name(prs, ["default"]) 
-        or _get_layout_by_matching_name(prs, ["title"]) 
-        or _get_layout_by_name(prs, ["HB Title / Content", "CUSTOM"])
-    )
-    if selected_layout is None:
-        selected_layout = prs.slide_layouts[1] if len(prs.slide_layouts) > 1 else prs.slide_layouts[0]
 
-    layout_anchors = _find_layout_anchor(selected_layout)
-    artwork_meta = _load_artwork_meta(os.path.join(artwork_dir, "_meta.json"))
+def _copy_slide(ctx: Dict[str, Any], src_slide):
+    slide = ctx["prs"].slides.add_slide(ctx["layout"])
+    src_rels = src_slide.part.rels
+    c_sld = copy.deepcopy(src_slide._element.cSld)
+    for el in c_sld.iter():
+        for attr, r_id in list(el.attrib.items()):
+            if not attr.startswith(_R_NS) or r_id not in src_rels:
+                continue
+            rel = src_rels[r_id]
+            if rel.is_external:
+                new_id = slide.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            elif rel.reltype == RT.IMAGE:
+                image = PptxImage.from_blob(rel.target_part.blob)
+                new_id = slide.part.relate_to(_registry_image_part(ctx, image), RT.IMAGE)
+            else:
+                raise ValueError(f"cannot copy slide relationship {rel.reltype}")
+            el.set(attr, new_id)
+    slide._element.replace(slide._element.cSld, c_sld)
+    return slide
+
+
+def _stream_digest(image_file) -> str | None:
+    if image_file is None:
+        return None
+    digest = hashlib.sha1()
+    if isinstance(image_file, (str, os.PathLike)):
+        with open(image_file, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    image_file.seek(0)
+    for block in iter(lambda: image_file.read(1024 * 1024), b""):
+        digest.update(block)
+    image_file.seek(0)
+    return digest.hexdigest()
+
+
+def _asset_digest(ctx: Dict[str, Any], path: str) -> str | None:
+    asset = _probe_asset(ctx, path)
+    return asset[0]["sha1"] if asset is not None else None
+
 
+def _product_fingerprint(ctx: Dict[str, Any], data: Dict[str, Any]) -> str | None:
+    try:
+        logo = data.get("logo")
+        doc = {
+            "text": [data.get(key) for key in ("season_item", "season_color", "name", "code", "rrp")],
+            "main_image": _stream_digest(data.get("main_image")) if data.get("main_image") else None,
+            "logo": [logo, _asset_digest(ctx, os.path.join(ctx["logo_dir"], logo))]
+            if logo and logo != "선택 없음"
+            else None,
+            "artworks": [
+                [name, _asset_digest(ctx, os.path.join(ctx["artwork_dir"], name)), _get_artwork_mode(name, ctx["artwork_meta"])]
+                for name in data.get("artworks", [])
+            ],
+            "colors": [[c.get("name"), _stream_digest(c.get("img")) if c.get("img") else None] for c in data.get("colors", [])],
+        }
+    except Exception:
+        return None
+    return hashlib.sha256(json.dumps(doc, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+def _fingerprinted(ctx: Dict[str, Any], products: Iterable[Dict[str, Any]], fingerprints: List[str | None]):
     for data in products:
-        slide = prs.slides.add_slide(selected_layout)
-
-        season_name = data.get("season_item", "")
-        if season_name:
-            _add_text_by_spec(slide, season_name, TEXT_SPECS["season"], color_override=data.get("season_color"))
-        _add_text_by_spec(slide, data.get("name", ""), TEXT_SPECS["category"])
-        _add_text_by_spec(slide, data.get("code", ""), TEXT_SPECS["code"])
-
-        if data.get("rrp"):
-            rrp_left = layout_anchors["rrp_label"].left if layout_anchors.get("rrp_label") else Mm(250)
-            rrp_top = layout_anchors["rrp_label"].top if layout_anchors.get("rrp_label") else Mm(15)
-            rrp = slide.shapes.add_textbox(rrp_left, rrp_top, Mm(50), Mm(15))
-            rrp.text_frame.text = f"RRP : {data['rrp']}"
-            rrp.text_frame.paragraphs[0].alignment = PP_ALIGN.RIGHT
-
-        if data.get("main_image"):
-            main_pic = slide.shapes.add_picture(data["main_image"], left=Mm(0), top=Mm(0), width=Mm(MAIN_IMAGE_WIDTH_MM))
-            main_pic.left = int(Mm(MAIN_IMAGE_CENTER_X_MM) - (main_pic.width / 2))
-            main_pic.top = int(Mm(MAIN_IMAGE_CENTER_Y_MM) - (main_pic.height / 2))
-
-        if data.get("logo") and data["logo"] != "선택 없음":
-            p_logo = os.path.join(logo_dir, data["logo"])
-            if os.path.exists(p_logo):
-                logo_pic = slide.shapes.add_picture(p_logo, left=Mm(0), top=Mm(0), height=Mm(LOGO_HEIGHT_MM))
-                logo_pic.left = int(Mm(LOGO_CENTER_X_MM) - (logo_pic.width / 2))
-                logo_pic.top = int(Mm(LOGO_CENTER_Y_MM) - (logo_pic.height / 2))
-
-        artworks = data.get("artworks", [])
-        if artworks:
-            current_top = int(Mm(ARTWORK_START_TOP_MM))
-            gap_emu = int(Mm(ARTWORK_VERTICAL_GAP_MM))
-            for art_name in artworks:
-                p_art = os.path.join(artwork_dir, art_name)
-                if not os.path.exists(p_art):
-                    continue
-                mode = _get_artwork_mode(art_name, artwork_meta)
-                if mode == ARTWORK_MODE_SMALL:
-                    art_pic = slide.shapes.add_picture(p_art, left=Mm(0), top=Mm(0), width=Mm(ARTWORK_SMALL_WIDTH_MM))
-                elif mode == ARTWORK_MODE_HORIZONTAL:
-                    art_pic = slide.shapes.add_picture(p_art, left=Mm(0), top=Mm(0), width=Mm(ARTWORK_DEFAULT_WIDTH_MM))
-                else:
-                    art_pic = slide.shapes.add_picture(p_art, left=Mm(0), top=Mm(0), height=Mm(ARTWORK_PORTRAIT_HEIGHT_MM))
-                art_pic.left = int(Mm(ARTWORK_CENTER_X_MM) - (art_pic.width / 2))
-                art_pic.top = current_top
-                current_top += art_pic.height + gap_emu
-
-        sx, sy, w, g = 180, COLORWAY_IMAGE_TOP_MM, COLORWAY_IMAGE_WIDTH_MM, 5
-        colors = data.get("colors", [])
-        color_count = len(colors)
-        is_two = color_count == 2
-        is_three = color_count == 3
-        if is_two:
-            sx = COLORWAY_TWO_ITEMS_LABEL_START_LEFT_MM
-            sy = COLORWAY_IMAGE_TOP_MM
-        if is_three:
-            sx = COLORWAY_THREE_ITEMS_LABEL_START_LEFT_MM
-            sy = COLORWAY_IMAGE_TOP_MM
-
-        per_row = 3
-        row_gap = 8
-        img_h = 30
-        rows = max(1, (len(colors) + per_row - 1) // per_row) if colors else 1
-        circled_nums = ["①", "②", "③", "④", "⑤", "⑥", "⑦", "⑧", "⑨", "⑩"]
-        for i, c in enumerate(colors):
-            row = i // per_row
-            col = i % per_row
-            cy = sy - (rows - 1 - row) * (img_h + row_gap + 10)
-            cx = sx + (col * (w + g))
-            if is_two:
-                cx = COLORWAY_TWO_ITEMS_LABEL_START_LEFT_MM + (i * COLORWAY_TWO_ITEMS_LABEL_GAP_MM)
-                cy = COLORWAY_IMAGE_TOP_MM
-            if is_three:
-                cx = COLORWAY_THREE_ITEMS_LABEL_START_LEFT_MM + (i * COLORWAY_THREE_ITEMS_LABEL_GAP_MM)
-                cy = COLORWAY_IMAGE_TOP_MM
-
-            if c.get("img"):
-                slide.shapes.add_picture(c["img"], left=Mm(cx), top=Mm(cy), width=Mm(COLORWAY_IMAGE_WIDTH_MM))
-
-            label = f"{circled_nums[i]}{_format_color_name(c.get('name'))}"
-            if (is_two or is_three) and rows == 1:
-                start_left = COLORWAY_TWO_ITEMS_LABEL_START_LEFT_MM if is_two else COLORWAY_THREE_ITEMS_LABEL_START_LEFT_MM
-                start_top = COLORWAY_TWO_ITEMS_LABEL_TOP_MM if is_two else COLORWAY_THREE_ITEMS_LABEL_TOP_MM
-                gap = COLORWAY_TWO_ITEMS_LABEL_GAP_MM if is_two else COLORWAY_THREE_ITEMS_LABEL_GAP_MM
-                _add_text_at(slide, label, start_left + (i * gap), start_top, 32.0, 5.0)
-            else:
-                tb = slide.shapes.add_textbox(Mm(cx), Mm(cy + img_h + 2), Mm(w), Mm(10))
-                tb.text_frame.text = _format_color_name(c.get("name"))
-                tb.text_frame.paragraphs[0].font.size = Pt(9)
-                tb.text_frame.paragraphs[0].alignment = PP_ALIGN.CENTER
+        started = time.perf_counter()
+        fingerprints.append(_product_fingerprint(ctx, data))
+        _add_phase(ctx["phases"], "fingerprint", started)
+        yield data
+
+
+def _manifest_header(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "version": _MANIFEST_VERSION,
+        "engine": ENGINE_DIGEST,
+        "template": template_digest(ctx["template_file"]),
+        "layout": layout_digest(ctx["template_file"]),
+        "image_options": ctx["image_options"],
+    }
+
+
+def _embed_manifest(ctx: Dict[str, Any], base_count: int, fingerprints: List[str | None]):
+    failed = {e["index"] for e in ctx["errors"]}
+    doc = dict(_manifest_header(ctx), base=base_count, slides=[fp for i, fp in enumerate(fingerprints) if i not in failed])
+    blob = '<manifest xmlns="%s">%s</manifest>' % (_MANIFEST_NS, escape(json.dumps(doc)))
+    package = ctx["prs"].part.package
+    part = Part(package.next_partname("/customXml/item%d.xml"), "application/xml", package, blob.encode("utf-8"))
+    ctx["prs"].part.relate_to(part, RT.CUSTOM_XML)
+
+
+def _read_manifest(prs: Presentation) -> Dict[str, Any] | None:
+    for rel in prs.part.rels.values():
+        if rel.is_external or rel.reltype != RT.CUSTOM_XML:
+            continue
+        blob = rel.target_part.blob
+        if _MANIFEST_NS.encode() not in blob:
+            continue
+        try:
+            doc = json.loads(ElementTree.fromstring(blob).text or "")
+        except (ElementTree.ParseError, ValueError):
+            return None
+        return doc if isinstance(doc, dict) else None
+    return None
+
+
+def _previous_slides(ctx: Dict[str, Any], previous) -> Dict[str, deque]:
+    prev = previous if hasattr(previous, "slides") else Presentation(previous)
+    manifest = _read_manifest(prev)
+    header = _manifest_header(ctx)
+    if manifest is None or any(manifest.get(key) != value for key, value in header.items()):
+        return {}
+    slides: Dict[str, deque] = defaultdict(deque)
+    for fingerprint, slide in zip(manifest.get("slides", []), list(prev.slides)[manifest.get("base", 0):]):
+        if fingerprint:
+            slides[fingerprint].append(slide)
+    return slides
 
+
+def _reuse_slide(ctx: Dict[str, Any], previous: Dict[str, deque], fingerprint: str | None) -> bool:
+    candidates = previous.get(fingerprint) if fingerprint else None
+    if not candidates:
+        return False
+    started = time.perf_counter()
+    _copy_slide(ctx, candidates.popleft())
+    ctx["reused"] += 1
+    _add_phase(ctx["phases"], "slide_reuse", started)
+    return True
+
+
+def parse_manifest(raw: bytes, filename: str) -> List[Dict[str, Any]]:
+    text = raw.decode("utf-8-sig")
+    suffix = os.path.splitext(filename)[1].lower()
+    if suffix == ".csv":
+        return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+    if suffix == ".jsonl":
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data.get("products", [])
+    if not isinstance(data, list):
+        raise ValueError("manifest must be a list of products")
+    return data
+
+
+def _portable_image(image_file):
+    if image_file is None or isinstance(image_file, (str, os.PathLike)):
+        return image_file
+    return io.BytesIO(_read_image_bytes(image_file))
+
+
+def _portable_product(data: Dict[str, Any]) -> Dict[str, Any]:
+    portable = dict(data)
+    portable["main_image"] = _portable_image(data.get("main_image"))
+    portable["colors"] = [dict(c, img=_portable_image(c.get("img"))) for c in data.get("colors", [])]
+    return portable
+
+
+def _build_chunk(
+    template_file: str,
+    logo_dir: str,
+    artwork_dir: str,
+    image_options: Dict[str, Any] | None,
+    skip_failed: bool,
+    offset: int,
+    products: List[Dict[str, Any]],
+    image_meta_dir: str = IMAGE_META_DIR,
+) -> Dict[str, Any]:
+    if image_meta_dir != IMAGE_META_DIR:
+        set_image_meta_dir(image_meta_dir)
+    ctx = _new_context(template_file, logo_dir, artwork_dir, image_options)
+    base_count = len(ctx["prs"].slides)
+    _build_slides(ctx, products, skip_failed, offset)
+    _flush_image_meta()
+    started = time.perf_counter()
     output = io.BytesIO()
-    prs.save(output)
-    output.seek(0)
+    save_pptx(ctx["prs"], output, media_level=0, xml_level=0, reuse_template=False)
+    _add_phase(ctx["phases"], "chunk_save", started)
+    return {
+        "blob": output.getvalue(),
+        "base_count": base_count,
+        "built": ctx["built"],
+        "errors": ctx["errors"],
+        "image_stats": ctx["image_stats"],
+        "image_meta": ctx["image_meta"],
+        "phases": ctx["phases"],
+    }
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    with _PROCESS_POOL_LOCK:
+        pool = _PROCESS_POOL["pool"]
+        if pool is None or _PROCESS_POOL["workers"] < workers:
+            if pool is not None:
+                pool.shutdown(wait=False)
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__])
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            _PROCESS_POOL.update(pool=pool, workers=workers)
+        return pool
+
+
+def _discard_process_pool(pool: ProcessPoolExecutor):
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL["pool"] is pool:
+            _PROCESS_POOL.update(pool=None, workers=0)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _product_chunks(products: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for data in products:
+        chunk.append(_portable_product(data))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _merge_chunk(ctx: Dict[str, Any], result: Dict[str, Any]):
+    started = time.perf_counter()
+    chunk = Presentation(io.BytesIO(result["blob"]))
+    for src_slide in list(chunk.slides)[result["base_count"]:]:
+        _copy_slide(ctx, src_slide)
+    _add_phase(ctx["phases"], "chunk_merge", started)
+    for name, elapsed in result["phases"].items():
+        ctx["phases"][name] = ctx["phases"].get(name, 0.0) + elapsed
+    ctx["built"] += result["built"]
+    ctx["errors"].extend(result["errors"])
+    _report_progress(ctx, ctx["built"] + len(ctx["errors"]))
+    for key, value in result["image_stats"].items():
+        ctx["image_stats"][key] = ctx["image_stats"].get(key, 0) + value
+    for key, value in result["image_meta"].items():
+        ctx["image_meta"][key] += value
+
+
+def _build_slides_parallel(ctx: Dict[str, Any], products: Iterable[Dict[str, Any]], skip_failed: bool, workers: int):
+    chunk_size = PARALLEL_CHUNK_SIZE
+    if ctx["total"]:
+        chunk_size = max(1, min(chunk_size, -(-ctx["total"] // workers)))
+    pool = None
+    pending: deque = deque()
+    offset = 0
+    try:
+        for chunk in _product_chunks(products, chunk_size):
+            if pool is None:
+                pool = _process_pool(workers)
+            pending.append(
+                pool.submit(
+                    _build_chunk,
+                    ctx["template_file"],
+                    ctx["logo_dir"],
+                    ctx["artwork_dir"],
+                    ctx["image_options"],
+                    skip_failed,
+                    offset,
+                    chunk,
+                    IMAGE_META_DIR,
+                )
+            )
+            offset += len(chunk)
+            if len(pending) >= workers * 2:
+                _merge_chunk(ctx, pending.popleft().result())
+        while pending:
+            _merge_chunk(ctx, pending.popleft().result())
+    except BrokenProcessPool:
+        _discard_process_pool(pool)
+        raise
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+
+
+def _record_stats(stats: Dict[str, Any], ctx: Dict[str, Any], started: float, workers: int):
+    elapsed = time.perf_counter() - started
+    built = ctx["built"]
+    stats["slides"] = built
+    stats["failed"] = len(ctx["errors"])
+    stats["errors"] = ctx["errors"]
+    stats["elapsed_s"] = round(elapsed, 4)
+    stats["slides_per_s"] = round(built / elapsed, 2) if elapsed > 0 else 0.0
+    stats["workers"] = max(1, workers)
+    media = ctx["media"]
+    stats["media_refs"] = media["refs"]
+    stats["media_parts"] = len(media["used"])
+    stats["media_dedup_ratio"] = round(media["refs"] / len(media["used"]), 2) if media["used"] else 1.0
+    stats["image_meta_hits"] = ctx["image_meta"]["hits"]
+    stats["image_meta_misses"] = ctx["image_meta"]["misses"]
+    stats["phases"] = {name: round(elapsed, 4) for name, elapsed in ctx["phases"].items()}
+    stats["reused"] = ctx["reused"]
+    stats["rebuilt"] = built - ctx["reused"]
+    image_stats = ctx["image_stats"]
+    if image_stats:
+        stats.update(image_stats)
+        stats["image_bytes_saved"] = image_stats["image_bytes_in"] - image_stats["image_bytes_out"]
+
+
+def build_pptx(
+    products: Iterable[Dict[str, Any]],
+    template_file: str = "template.pptx",
+    logo_dir: str = "assets/logos",
+    artwork_dir: str = "assets/artworks",
+    stats: Dict[str, Any] | None = None,
+    skip_failed: bool = False,
+    image_options: Dict[str, Any] | None = None,
+    workers: int = 1,
+    progress: Callable[[int, int | None], None] | None = None,
+    incremental: bool = False,
+    previous: str | IO[bytes] | Presentation | None = None,
+):
+    started = time.perf_counter()
+    ctx = _new_context(template_file, logo_dir, artwork_dir, image_options)
+    ctx["template_file"] = template_file
+    ctx["progress"] = progress
+    ctx["total"] = len(products) if hasattr(products, "__len__") else None
+    base_count = len(ctx["prs"].slides)
+    fingerprints = None
+    reusable: Dict[str, deque] = {}
+    if incremental or previous is not None:
+        fingerprints = []
+        products = _fingerprinted(ctx, products, fingerprints)
+        if previous is not None:
+            reusable = _previous_slides(ctx, previous)
+    if reusable:
+        _build_slides(ctx, products, skip_failed, reuse=lambda index: _reuse_slide(ctx, reusable, fingerprints[index]))
+    elif workers > 1:
+        _build_slides_parallel(ctx, products, skip_failed, workers)
+    else:
+        _build_slides(ctx, products, skip_failed)
+    if fingerprints is not None:
+        _embed_manifest(ctx, base_count, fingerprints)
+    _flush_image_meta()
+    _report_progress(ctx, ctx["built"] + len(ctx["errors"]))
+
+    if stats is not None:
+        _record_stats(stats, ctx, started, workers)
+    return ctx["prs"]
+
+
+def _template_member(name: str, data: bytes) -> Dict[str, Any] | None:
+    for entry in list(_TEMPLATE_CACHE.values()):
+        member = entry["members"].get(name)
+        if member is not None and member["data"] == data:
+            return member
+    return None
+
+
+def _zip_write(zf: zipfile.ZipFile, name: str, data: bytes, level: int):
+    if level <= 0:
+        zf.writestr(name, data, compress_type=zipfile.ZIP_STORED)
+    else:
+        zf.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=min(level, 9))
+
+
+# Raw member copies go through these ZipFile internals; without any of them (a future CPython),
+# save_pptx falls back to writestr so the deck is still written, just recompressed.
+ZIP_RAW_ATTRS = ("fp", "filelist", "NameToInfo", "start_dir", "_seekable", "_didModify", "_writecheck")
+
+
+def zip_raw_supported(zf: zipfile.ZipFile) -> bool:
+    return all(hasattr(zf, attr) for attr in ZIP_RAW_ATTRS)
+
+
+def _zip_write_raw(zf: zipfile.ZipFile, name: str, data: bytes, member: Dict[str, Any]) -> bool:
+    if not zip_raw_supported(zf):
+        return False
+    info = zipfile.ZipInfo(name, time.localtime(time.time())[:6])
+    info.compress_type = member["compress_type"]
+    info.external_attr = 0o600 << 16
+    info.CRC = member["crc"]
+    info.file_size = len(data)
+    info.compress_size = len(member["raw"])
+    if zf._seekable:
+        zf.fp.seek(zf.start_dir)
+    info.header_offset = zf.fp.tell()
+    zf._writecheck(info)
+    zf._didModify = True
+    zf.fp.write(info.FileHeader())
+    zf.fp.write(member["raw"])
+    zf.filelist.append(info)
+    zf.NameToInfo[name] = info
+    zf.start_dir = zf.fp.tell()
+    return True
+
+
+def save_pptx(
+    prs: Presentation,
+    output: str | IO[bytes],
+    media_level: int = SAVE_MEDIA_LEVEL,
+    xml_level: int = SAVE_XML_LEVEL,
+    reuse_template: bool = True,
+) -> Dict[str, int]:
+    package = prs.part.package
+    parts = tuple(package.iter_parts())
+    counts = {"stored": 0, "deflated": 0, "reused": 0}
+
+    def write(name: str, data: bytes, level: int):
+        member = _template_member(name, data) if reuse_template else None
+        if member is not None and _zip_write_raw(zf, name, data, member):
+            counts["reused"] += 1
+            return
+        _zip_write(zf, name, data, level)
+        counts["stored" if level <= 0 else "deflated"] += 1
+
+    with zipfile.ZipFile(output, "w", strict_timestamps=False) as zf:
+        write(CONTENT_TYPES_URI.membername, serialize_part_xml(_ContentTypesItem.xml_for(parts)), xml_level)
+        write(PACKAGE_URI.rels_uri.membername, package._rels.xml, xml_level)
+        for part in parts:
+            content_type = part.content_type
+            precompressed = content_type in PRECOMPRESSED_CONTENT_TYPES or content_type.startswith(("audio/", "video/"))
+            write(part.partname.membername, part.blob, media_level if precompressed else xml_level)
+            if part._rels:
+                write(part.partname.rels_uri.membername, part.rels.xml, xml_level)
+    return counts
+
+
+class _ChunkSink:
+    def __init__(self, chunks: "queue.Queue", chunk_size: int, cancelled: threading.Event):
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._cancelled = cancelled
+        self._buf = bytearray()
+
+    def _put(self, item):
+        while True:
+            if self._cancelled.is_set():
+                raise BrokenPipeError("pptx stream consumer went away")
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def write(self, data) -> int:
+        self._buf += data
+        while len(self._buf) >= self._chunk_size:
+            self._put(bytes(self._buf[: self._chunk_size]))
+            del self._buf[: self._chunk_size]
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self._buf:
+            self._put(bytes(self._buf))
+            self._buf = bytearray()
+
+
+def iter_pptx_chunks(
+    prs: Presentation,
+    chunk_size: int = 1024 * 1024,
+    max_pending: int = 4,
+    save_options: Dict[str, Any] | None = None,
+) -> Iterator[bytes]:
+    chunks: "queue.Queue" = queue.Queue(maxsize=max_pending)
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        sink = _ChunkSink(chunks, chunk_size, cancelled)
+        try:
+            if save_options is None:
+                prs.save(sink)
+            else:
+                save_pptx(prs, sink, **save_options)
+            sink.close()
+            sink._put(done)
+        except BaseException as e:
+            try:
+                sink._put(e)
+            except BrokenPipeError:
+                pass
+
+    worker = threading.Thread(target=produce, name="pptx-stream", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        cancelled.set()
+        worker.join()
+
+
+def generate_pptx(
+    products: Iterable[Dict[str, Any]],
+    template_file: str = "template.pptx",
+    logo_dir: str = "assets/logos",
+    artwork_dir: str = "assets/artworks",
+    stats: Dict[str, Any] | None = None,
+    skip_failed: bool = False,
+    image_options: Dict[str, Any] | None = None,
+    workers: int = 1,
+    progress: Callable[[int, int | None], None] | None = None,
+    output: str | IO[bytes] | None = None,
+    incremental: bool = False,
+    previous: str | IO[bytes] | Presentation | None = None,
+    save_options: Dict[str, Any] | None = None,
+):
+    started = time.perf_counter()
+    prs = build_pptx(
+        products,
+        template_file=template_file,
+        logo_dir=logo_dir,
+        artwork_dir=artwork_dir,
+        stats=stats,
+        skip_failed=skip_failed,
+        image_options=image_options,
+        workers=workers,
+        progress=progress,
+        incremental=incremental,
+        previous=previous,
+    )
+
+    saved = time.perf_counter()
+    if output is None:
+        output = io.BytesIO()
+    if save_options is None:
+        prs.save(output)
+    else:
+        save_pptx(prs, output, **save_options)
+    if not isinstance(output, (str, os.PathLike)):
+        output.seek(0)
+
+    if stats is not None:
+        stats.setdefault("phases", {})["save"] = round(time.perf_counter() - saved, 4)
+        elapsed = time.perf_counter() - started
+        stats["elapsed_s"] = round(elapsed, 4)
+        stats["slides_per_s"] = round(stats["slides"] / elapsed, 2) if elapsed > 0 else 0.0
     return output
@@ -0,0 +1,40 @@
+import io
+import zipfile
+from pathlib import Path
+
+import ppt_engine
+
+TEMPLATE = str(Path(__file__).resolve().parent.parent / "template.pptx")
+
+
+def _save(**options):
+    prs = ppt_engine._open_template(TEMPLATE)[0]
+    out = io.BytesIO()
+    counts = ppt_engine.save_pptx(prs, out, **options)
+    with zipfile.ZipFile(out) as zf:
+        assert zf.testzip() is None
+        members = {info.filename: zf.read(info) for info in zf.infolist()}
+    return counts, members
+
+
+def test_zipfile_internals_present():
+    # Fails when CPython renames the ZipFile internals _zip_write_raw relies on.
+    with zipfile.ZipFile(io.BytesIO(), "w") as zf:
+        missing = [attr for attr in ppt_engine.ZIP_RAW_ATTRS if not hasattr(zf, attr)]
+        assert not missing
+        assert ppt_engine.zip_raw_supported(zf)
+
+
+def test_raw_copy_matches_writestr():
+    reused, reused_members = _save()
+    plain, plain_members = _save(reuse_template=False)
+    assert reused["reused"] > 0
+    assert plain["reused"] == 0
+    assert reused_members == plain_members
+
+
+def test_falls_back_without_internals(monkeypatch):
+    monkeypatch.setattr(ppt_engine, "ZIP_RAW_ATTRS", ppt_engine.ZIP_RAW_ATTRS + ("_not_a_zipfile_attr",))
+    counts, members = _save()
+    assert counts["reused"] == 0
+    assert members == _save(reuse_template=False)[1]